@@ -1,11 +1,16 @@
+import itertools
 import math
 
 import numpy as np
 import pandas as pd
-import scipy.optimize as optimize
+from scipy.linalg import solve_triangular
+from scipy.optimize import brentq
+from scipy.special import comb
 
 
 def future_value_factor(ytm, periods):
+    if isinstance(periods, int):
+        return (1.0 + ytm) ** periods
     return math.pow(1 + ytm, periods)
 
 
@@ -13,19 +18,213 @@ def present_value_factor(ytm, periods):
     return future_value_factor(ytm, -periods)
 
 
+def price_vec(face_value, coupon, periods, ytm):
+    """The clean prices of coupon paying bonds, broadcast over array-like inputs"""
+    face_value = np.asarray(face_value, dtype=np.float64)
+    coupon = np.asarray(coupon, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.float64)
+    ytm = np.asarray(ytm, dtype=np.float64)
+    pv_factor = np.power(1.0 + ytm, -periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annuity_factor = np.where(ytm != 0.0, (1 - pv_factor) / ytm, periods)
+    return coupon * annuity_factor + face_value * pv_factor
+
+
 def price(face_value, coupon, periods, ytm):
     """The clean price of a coupon paying bond"""
-    pv_factor = present_value_factor(ytm, periods)
-    annuity_factor = 1 / ytm * (1 - pv_factor) if ytm != 0.0 else periods
+    if any(np.ndim(arg) > 0 for arg in (face_value, coupon, periods, ytm)):
+        return price_vec(face_value, coupon, periods, ytm)
+    return _price_scalar(face_value, coupon, periods, ytm)
+
+
+def _price_scalar(face_value, coupon, periods, ytm):
+    if ytm == 0.0:
+        return coupon * periods + face_value
+    # log1p and expm1 keep full precision in the annuity factor for small yields.
+    log_discount = -periods * math.log1p(ytm)
+    pv_factor = math.exp(log_discount)
+    if coupon == 0.0:
+        return face_value * pv_factor
+    annuity_factor = -math.expm1(log_discount) / ytm
     return coupon * annuity_factor + face_value * pv_factor
 
 
-def yield_to_maturity(bond_price, face_value, periods, coupon, guess=0.05):
-    return optimize.newton(
-        lambda ytm: price(face_value, coupon, periods, ytm) - bond_price, guess
+def price_derivative(face_value, coupon, periods, ytm):
+    """The derivative of the clean price with respect to yield to maturity"""
+    if ytm == 0.0:
+        return -coupon * periods * (periods + 1) / 2 - periods * face_value
+    growth = 1.0 + ytm
+    pv_factor = (
+        growth ** -periods if isinstance(periods, int) else math.pow(growth, -periods)
+    )
+    return (
+        -coupon / ytm * (1 - pv_factor) / ytm
+        + periods * (coupon / ytm - face_value) * pv_factor / growth
+    )
+
+
+def _secant_then_newton(f, fprime, x0, secant_iters=2, tol=1e-10, maxiter=50):
+    """Find a root of f with a few derivative-free secant steps, then Newton"""
+    guess, x1 = x0, x0 + 1e-4
+    f0, f1 = f(x0), f(x1)
+    for _ in range(secant_iters):
+        if f1 == f0:
+            break
+        x0, x1 = x1, x1 - f1 * (x1 - x0) / (f1 - f0)
+        f0, f1 = f1, f(x1)
+        if abs(x1 - x0) < tol:
+            return x1
+    for _ in range(maxiter):
+        step = f1 / fprime(x1)
+        x1 -= step
+        if abs(step) < tol:
+            return x1
+        f1 = f(x1)
+    raise RuntimeError(f"Root finding failed to converge from x0={guess}")
+
+
+def yield_to_maturity(
+    bond_price, face_value, periods, coupon, guess=0.05, tol=1e-10, maxiter=50
+):
+    def error(ytm):
+        return _price_scalar(face_value, coupon, periods, ytm) - bond_price
+
+    try:
+        ytm = _secant_then_newton(
+            error,
+            lambda ytm: price_derivative(face_value, coupon, periods, ytm),
+            guess,
+            tol=tol,
+            maxiter=maxiter,
+        )
+    except (ZeroDivisionError, OverflowError, ValueError, RuntimeError):
+        ytm = math.nan
+    if ytm > -1.0:
+        return ytm
+    # Newton failed to converge or left the domain of the price function, so
+    # fall back to a bracketed Brent solve, which always terminates.
+    if error(0.0) > 0:
+        lower, upper = 0.0, 1.0
+        while error(upper) > 0 and upper < 1e6:
+            lower, upper = upper, 2 * upper
+    else:
+        # Widen downward in log(1 + ytm), stopping before the discount factors
+        # (1 + ytm) ** -periods overflow.
+        upper, log_growth = 0.0, 1e-3
+        lower = math.expm1(-log_growth)
+        while error(lower) <= 0 and 2 * log_growth * periods < 700:
+            upper, log_growth = lower, 2 * log_growth
+            lower = math.expm1(-log_growth)
+    return brentq(error, lower, upper, xtol=tol)
+
+
+def _t_binomial_sum(n, k):
+    """sum(t * C(t, k)) for t in 1..n"""
+    return (k + 1) * comb(n + 1, k + 2, exact=True) + k * comb(n + 1, k + 1, exact=True)
+
+
+def _ttp1_binomial_sum(n, k):
+    """sum(t * (t + 1) * C(t, k)) for t in 1..n"""
+    return (
+        (k + 1) * (k + 2) * comb(n + 1, k + 3, exact=True)
+        + 2 * (k + 1) * (k + 1) * comb(n + 1, k + 2, exact=True)
+        + k * (k + 1) * comb(n + 1, k + 1, exact=True)
     )
 
 
+def _binomial_expansion(binomial_sum, v, n):
+    """Sum binomial_sum(n, k) * (v - 1)^k over k, stopping once terms vanish"""
+    # Expanding v^t = sum(C(t, k) * (v - 1)^k) turns a sum over the periods
+    # into a few terms, since the binomial sums over t have closed forms.
+    n, x = int(n), v - 1
+    total = 0.0
+    for k in range(n + 1):
+        term = binomial_sum(n, k) * x ** k
+        total += term
+        if abs(term) <= 1e-17 * abs(total):
+            break
+    return total
+
+
+def _sum_t_vt(v, n):
+    """The closed form of sum(t * v^t) for t in 1..n"""
+    # The closed form cancels catastrophically near v == 1.
+    if n * abs(1 - v) < 1:
+        return _binomial_expansion(_t_binomial_sum, v, n)
+    return v * (1 - (n + 1) * v ** n + n * v ** (n + 1)) / (1 - v) ** 2
+
+
+def _sum_ttp1_vt(v, n):
+    """The closed form of sum(t * (t + 1) * v^t) for t in 1..n"""
+    if n * abs(1 - v) < 1:
+        return _binomial_expansion(_ttp1_binomial_sum, v, n)
+    tail = (n + 1) * (n + 2) - 2 * n * (n + 2) * v + n * (n + 1) * v * v
+    return (2 * v - v ** (n + 1) * tail) / (1 - v) ** 3
+
+
+def price_derivative_vec(face_value, coupon, periods, ytm):
+    """The derivatives of clean prices with respect to ytm, broadcast over inputs"""
+    face_value = np.asarray(face_value, dtype=np.float64)
+    coupon = np.asarray(coupon, dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.float64)
+    ytm = np.asarray(ytm, dtype=np.float64)
+    pv_factor = np.power(1.0 + ytm, -periods)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(
+            ytm != 0.0,
+            -coupon * (1 - pv_factor) / ytm ** 2
+            + periods * (coupon / ytm - face_value) * pv_factor / (1 + ytm),
+            -coupon * periods * (periods + 1) / 2 - periods * face_value,
+        )
+
+
+def yields_to_maturity(
+    bond_price, face_value, periods, coupon, guess=0.05, tol=1e-10, maxiter=50
+):
+    """The yields to maturity of many bonds, solved with a broadcast Newton loop"""
+    arrays = np.broadcast_arrays(
+        *(
+            np.asarray(arg, dtype=np.float64)
+            for arg in (bond_price, face_value, periods, coupon)
+        )
+    )
+    shape = arrays[0].shape
+    bond_price, face_value, periods, coupon = (np.ravel(arg) for arg in arrays)
+    ytm = np.full(bond_price.shape, guess, dtype=np.float64)
+    active = np.arange(ytm.size)
+    failed = []
+    for _ in range(maxiter):
+        args = face_value[active], coupon[active], periods[active], ytm[active]
+        error = price_vec(*args) - bond_price[active]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = error / price_derivative_vec(*args)
+        ytm[active] -= step
+        in_domain = ytm[active] > -1.0
+        failed.append(active[~in_domain])
+        active = active[in_domain & ~(np.abs(step) < tol)]
+        if active.size == 0:
+            break
+    # Lanes that went NaN, left the domain or did not converge are solved one
+    # at a time, so they get the scalar fallback or its error.
+    for i in np.concatenate(failed + [active]):
+        ytm[i] = yield_to_maturity(
+            bond_price[i], face_value[i], periods[i], coupon[i], guess, tol, maxiter
+        )
+    return ytm.reshape(shape)
+
+
+def price_from_cashflows(cashflows, discounts):
+    """The prices of bonds given as rows of cash flows and their discount factors"""
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    discounts = np.asarray(discounts, dtype=np.float64)
+    if discounts.ndim == 1:
+        if cashflows.ndim == 1:
+            return np.vdot(cashflows, discounts)
+        # Discounts shared by every bond reduce to one matrix-vector product.
+        return np.ascontiguousarray(cashflows) @ discounts
+    return np.einsum("ij,ij->i", cashflows, discounts)
+
+
 def to_periods(maturity_years, freq=2):
     return int(maturity_years * freq)
 
@@ -39,22 +238,44 @@ def period_ytm(annual_ytm, freq=2):
 
 
 def can_bootstrap(portfolio):
-    periods = set(bond.periods for bond in portfolio)
-    return periods == set(range(1, max(periods) + 1))
+    """Whether the portfolio has exactly one bond maturing in each period 1..n"""
+    seen, count = 0, 0
+    for bond in portfolio:
+        periods = bond.periods
+        if periods < 1 or periods == math.inf:
+            return False
+        bit = 1 << int(periods - 1)
+        if seen & bit:
+            return False
+        seen |= bit
+        count += 1
+    return count > 0 and seen == (1 << count) - 1
+
+
+def _cash_flow_matrix(portfolio):
+    """The dense cash flow matrix and price vector of a portfolio"""
+    # Read each bond once into columns, then build the matrix by broadcasting.
+    periods, coupons, face_values, prices = np.array(
+        [(b.periods, b.coupon, b.face_value, b.price) for b in portfolio],
+        dtype=np.float64,
+    ).T
+    periods = periods.astype(np.int64)
+    paying = np.arange(periods.max()) < periods[:, np.newaxis]
+    cfs = np.where(paying, coupons[:, np.newaxis], 0.0)
+    cfs[np.arange(len(periods)), periods - 1] += face_values
+    return cfs, prices
 
 
 def cash_flows(portfolio):
-    longest_bond = max(portfolio, key=lambda bond: bond.periods)
-    cfs = [[cf for _, cf in bond] for bond in portfolio]
-    return [cf + [0.0] * (longest_bond.periods - len(cf)) for cf in cfs]
+    cfs, _ = _cash_flow_matrix(portfolio)
+    return cfs.tolist()
 
 
 def bootstrap(portfolio):
     assert can_bootstrap(portfolio), "Bonds in portfolio cannot be bootstrapped"
-    prices = np.row_stack([bond.price for bond in portfolio])
-    cfs = np.matrix(cash_flows(portfolio))
-    dfs = cfs.getI() @ prices
-    dfs = np.array(dfs).reshape(-1).tolist()
+    portfolio = sorted(portfolio, key=lambda bond: bond.periods)
+    cfs, prices = _cash_flow_matrix(portfolio)
+    dfs = solve_triangular(cfs, prices, lower=True).tolist()
     return [
         Zero.from_price(bond_price=df, periods=n, face_value=1.0)
         for n, df in enumerate(dfs, start=1)
@@ -62,20 +283,30 @@ def bootstrap(portfolio):
 
 
 def to_dataframe(portfolio):
-    df = [vars(b) for b in portfolio]
-    df = pd.DataFrame(df)
-    df.columns = [k[1:] if k.startswith("_") else k for k in df.columns]
-    return df
+    df = [{field: getattr(b, field) for field in b._fields} for b in portfolio]
+    return pd.DataFrame(df)
 
 
 class CouponBond:
+    __slots__ = (
+        "_face_value",
+        "_coupon",
+        "_periods",
+        "_ytm",
+        "_price",
+        "_macaulay_duration",
+        "_ytm_convexity",
+    )
+    _fields = ("face_value", "coupon", "periods", "ytm", "price")
+
     def __init__(self, face_value, coupon, periods, ytm):
-        assert isinstance(periods, (int, np.integer)) or periods == math.inf
+        assert type(periods) is int or isinstance(periods, np.integer)
         self._face_value = face_value
         self._coupon = coupon
         self._periods = periods
         self._ytm = ytm
         self._price = price(self.face_value, self.coupon, self.periods, self.ytm)
+        self._macaulay_duration, self._ytm_convexity = self._sensitivities()
 
     @property
     def face_value(self):
@@ -99,10 +330,7 @@ class CouponBond:
 
     @property
     def macaulay_duration(self):
-        weighted_cash_flow = sum(
-            t * cash_flow * present_value_factor(self.ytm, t) for t, cash_flow in self
-        )
-        return weighted_cash_flow / self.price
+        return self._macaulay_duration
 
     @property
     def duration(self):
@@ -117,28 +345,49 @@ class CouponBond:
 
     @property
     def ytm_convexity(self):
-        weighted_cash_flow = sum(
-            t * (t + 1) * cash_flow * present_value_factor(self.ytm, t)
-            for t, cash_flow in self
+        return self._ytm_convexity
+
+    def _sensitivities(self):
+        """The macaulay duration and ytm convexity from geometric series closed forms"""
+        if self.price == 0:
+            return math.nan, math.nan
+        n = self.periods
+        discount = 1 / (1 + self.ytm)
+        if self.coupon == 0:
+            # A zero's only cash flow is at maturity, so no discounting is needed.
+            return n, n * (n + 1) * discount * discount
+        # Discount the face value exactly as _price_scalar does.
+        face_value_pv = self.face_value * math.exp(-n * math.log1p(self.ytm))
+        weighted_cash_flow = self.coupon * _sum_t_vt(discount, n) + n * face_value_pv
+        convexity_cash_flow = (
+            self.coupon * _sum_ttp1_vt(discount, n) + n * (n + 1) * face_value_pv
         )
-        return weighted_cash_flow / self.price * present_value_factor(self.ytm, 2)
+        macaulay_duration = weighted_cash_flow / self.price
+        ytm_convexity = convexity_cash_flow / self.price * discount * discount
+        return macaulay_duration, ytm_convexity
 
     def __eq__(self, other):
-        if isinstance(other, CouponBond):
-            return all(
-                math.isclose(self.__dict__[key], other.__dict__[key])
-                for key in self.__dict__
-            )
-        return NotImplemented
+        if self is other:
+            return True
+        if not isinstance(other, CouponBond):
+            return NotImplemented
+        # Price, duration and convexity are derived from these four fields.
+        return (
+            self.periods == other.periods
+            and math.isclose(self._ytm, other._ytm)
+            and math.isclose(self._coupon, other._coupon)
+            and math.isclose(self._face_value, other._face_value)
+        )
 
     def __iter__(self):
-        for t in range(1, self.periods):
-            yield t, self.coupon
-        yield self.periods, self.coupon + self.face_value
+        coupon, periods = self._coupon, self._periods
+        for t in range(1, periods):
+            yield t, coupon
+        yield periods, coupon + self._face_value
 
     def __repr__(self):
         property_string = ", ".join(
-            "{}={:.7g}".format(k[1:], v) for k, v in self.__dict__.items()
+            "{}={:.7g}".format(field, getattr(self, field)) for field in self._fields
         )
         return "{}({})".format(self.__class__.__name__, property_string)
 
@@ -158,16 +407,22 @@ class CouponBond:
     @classmethod
     def from_dataframe(cls, df):
         assert {"coupon", "bond_price", "periods", "face_value"}.issubset(df.columns)
-        for index, row in df.iterrows():
-            yield cls.from_price(
-                face_value=row.face_value,
-                coupon=row.coupon,
-                periods=row.periods,
-                bond_price=row.bond_price,
-            )
+        face_values = df.face_value.to_numpy()
+        coupons = df.coupon.to_numpy()
+        periods = df.periods.to_numpy()
+        ytms = yields_to_maturity(
+            bond_price=df.bond_price.to_numpy(),
+            face_value=face_values,
+            periods=periods,
+            coupon=coupons,
+        )
+        for face_value, coupon, n, ytm in zip(face_values, coupons, periods, ytms):
+            yield cls(face_value=face_value, coupon=coupon, periods=n, ytm=ytm)
 
 
 class Zero(CouponBond):
+    __slots__ = ()
+
     def __init__(self, face_value, periods, ytm):
         super().__init__(face_value=face_value, coupon=0, periods=periods, ytm=ytm)
 
@@ -176,30 +431,36 @@ class Zero(CouponBond):
 
     @classmethod
     def from_price(cls, bond_price, face_value, periods, **kwargs):
-        ytm = yield_to_maturity(
-            bond_price=bond_price, face_value=face_value, coupon=0.0, periods=periods
-        )
+        assert bond_price > 0, "Zero bond price must be positive"
+        ytm = math.pow(face_value / bond_price, 1.0 / periods) - 1.0
         return cls(face_value, periods, ytm)
 
 
 class Perpetuity(CouponBond):
+    __slots__ = ()
+
     def __init__(self, coupon, ytm):
-        super().__init__(face_value=0, coupon=coupon, periods=math.inf, ytm=ytm)
+        self._face_value = 0
+        self._coupon = coupon
+        self._periods = None
+        self._ytm = ytm
+        self._price = coupon / ytm
+        self._macaulay_duration, self._ytm_convexity = self._sensitivities()
 
     @property
-    def price(self):
-        return self.coupon / self.ytm
+    def periods(self):
+        return math.inf
 
-    @property
-    def macaulay_duration(self):
-        return (1 + self.ytm) / self.ytm
+    def __iter__(self):
+        for t in itertools.count(1):
+            yield t, self.coupon
 
-    @property
-    def ytm_convexity(self):
-        return 2 / math.pow(self.ytm, 2)
+    def _sensitivities(self):
+        return (1 + self.ytm) / self.ytm, 2 / math.pow(self.ytm, 2)
 
 
 class TreasuryNote(CouponBond):
+    __slots__ = ()
     _par = 100.0
     _freq = 2
 
@@ -237,12 +498,18 @@ class TreasuryNote(CouponBond):
     @classmethod
     def from_dataframe(cls, df):
         assert {"coupon_rate", "bond_price", "maturity_years"}.issubset(df.columns)
-        for index, row in df.iterrows():
-            yield cls.from_price(
-                bond_price=row.bond_price,
-                coupon_rate=row.coupon_rate,
-                maturity_years=row.maturity_years,
-            )
+        coupon_rates = df.coupon_rate.to_numpy(dtype=np.float64)
+        maturity_years = df.maturity_years.to_numpy(dtype=np.float64)
+        semi_annual_ytms = yields_to_maturity(
+            bond_price=df.bond_price.to_numpy(),
+            face_value=cls._par,
+            periods=np.trunc(maturity_years * cls._freq),
+            coupon=to_coupon(cls._par, coupon_rates, cls._freq),
+        )
+        for coupon_rate, years, ytm in zip(
+            coupon_rates, maturity_years, semi_annual_ytms
+        ):
+            yield cls(coupon_rate, years, ytm * cls._freq)
 
 
 class FloatingRateBond:
@@ -255,26 +522,29 @@ class FloatingRateBond:
         self._periods = to_periods(maturity_years, self._freq)
         self._interest_rate = interest_rate
         self._spread_rate = spread_rate
-        self._fixed_bond = CouponBond(
-            face_value=0,
-            coupon=to_coupon(self._face_value, spread_rate, self._freq),
-            periods=self._periods,
-            ytm=period_ytm(interest_rate, self._freq),
-        )
+        self._floating_coupon_scale = self._face_value / self._freq
+        self._fixed_coupon = to_coupon(self._face_value, spread_rate, self._freq)
+        self._fixed_bond = None
 
     def reset(self, period, interest_rate):
         self._periods -= period
         self._interest_rate = interest_rate
-        self._fixed_bond = CouponBond(
-            face_value=0,
-            coupon=to_coupon(self._par, self._spread_rate, self._freq),
-            periods=self._periods,
-            ytm=period_ytm(interest_rate, self._freq),
-        )
+        # The spread leg is only repriced when its price is next needed.
+        self._fixed_bond = None
+
+    def _spread_leg(self):
+        if self._fixed_bond is None:
+            self._fixed_bond = CouponBond(
+                face_value=0,
+                coupon=self._fixed_coupon,
+                periods=self._periods,
+                ytm=period_ytm(self._interest_rate, self._freq),
+            )
+        return self._fixed_bond
 
     @property
     def face_value(self):
-        return self._par
+        return self._face_value
 
     @property
     def freq(self):
@@ -298,17 +568,15 @@ class FloatingRateBond:
 
     @property
     def fixed_coupon(self):
-        return self._fixed_bond.coupon
+        return self._fixed_coupon
 
     @property
     def coupon(self):
-        return self._fixed_bond.coupon + to_coupon(
-            self._par, self._interest_rate, self._freq
-        )
+        return self._fixed_coupon + self._floating_coupon_scale * self._interest_rate
 
     @property
     def price(self):
-        return self._face_value + self._fixed_bond.price
+        return self._face_value + self._spread_leg().price
 
     @property
     def duration(self):
@@ -326,7 +594,10 @@ class InverseFloatingRateBond:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return vars(self) == vars(other)
+            return all(
+                math.isclose(value, other_value)
+                for value, other_value in zip(vars(self).values(), vars(other).values())
+            )
         else:
             return NotImplemented
 
@@ -354,17 +625,17 @@ class InverseFloatingRateBond:
     @classmethod
     def from_zeros(cls, zeros, fixed_coupon, maturity, leverage, freq=2):
         assert len(zeros) == freq * maturity
-        payments = fixed_coupon / freq * np.ones((maturity * freq,))
+        zeros = np.asarray(zeros, dtype=np.float64)
+        payments = np.full(maturity * freq, fixed_coupon / freq)
         payments[-1] += cls._par
-        price_fixed = sum(p * z for p, z in zip(payments, zeros))
+        times = np.arange(1, maturity * freq + 1) / freq
+        discounted_payments = payments * zeros
+        price_fixed = discounted_payments.sum()
         price_float = cls._par
         price_zero = cls._par * zeros[-1]
         price = price_fixed + leverage * (price_zero - price_float)
 
-        duration_fixed = sum(
-            p * t / freq * z for t, (p, z) in enumerate(zip(payments, zeros), start=1)
-        )
-        duration_fixed /= price_fixed
+        duration_fixed = times @ discounted_payments / price_fixed
         duration_float = 1 / freq
         duration_zero = maturity
 
@@ -374,11 +645,7 @@ class InverseFloatingRateBond:
             - price_float * leverage * duration_float
         ) / price
 
-        convexity_fixed = sum(
-            p * pow(t / freq, 2) * z
-            for t, (p, z) in enumerate(zip(payments, zeros), start=1)
-        )
-        convexity_fixed /= price_fixed
+        convexity_fixed = (times * times) @ discounted_payments / price_fixed
         convexity_float = duration_float ** 2
         convexity_zero = duration_zero ** 2
 
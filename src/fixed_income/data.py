@@ -1,4 +1,6 @@
 import datetime
+import functools
+import io
 
 import numpy as np
 import pandas as pd
@@ -19,6 +21,8 @@ SECURITY_FIELDS = [
     "rspoeopening",
 ]
 
+_SESSION = requests.Session()
+
 
 def _columns_of(table):
     return table.loc[0, :].values.tolist()
@@ -29,9 +33,8 @@ def _find_price(tables):
 
 
 def _create_df(table):
-    df = table.copy()
-    df.columns = _columns_of(df)
-    df = df.drop(df.index[0])
+    df = table.iloc[1:].copy()
+    df.columns = _columns_of(table)
     return df
 
 
@@ -43,6 +46,20 @@ def _get_date(date):
     raise NotImplementedError(f"{type(date)} not supported.")
 
 
+@functools.lru_cache(maxsize=64)
+def _get_html(url):
+    response = _SESSION.get(url)
+    assert response.ok
+    return response.text
+
+
+@functools.lru_cache(maxsize=64)
+def _post_html(url, data):
+    response = _SESSION.post(url, data=dict(data))
+    assert response.ok
+    return response.text
+
+
 def wsj_treasury_prices(date=None):
     """Get US Treasury Bill, Note and Bond prices from www.wsj.com
 
@@ -59,17 +76,16 @@ def wsj_treasury_prices(date=None):
     if date:
         date_string = date if isinstance(date, str) else date.strftime(DATE_FORMAT)
         url = f"http://www.wsj.com/mdc/public/page/2_3020-treasury-{date_string}.html?mod=mdc_pastcalendar"
+        tables = pd.read_html(io.StringIO(_get_html(url)))
     else:
         url = (
             "http://www.wsj.com/mdc/public/page/2_3020-treasury.html?mod=3D=#treasuryB"
         )
+        tables = pd.read_html(url)
 
-    tables = pd.read_html(url)
-    df = pd.concat(_create_df(t) for t in _find_price(tables))
+    df = pd.concat([_create_df(t) for t in _find_price(tables)], ignore_index=True)
     df["Maturity"] = pd.to_datetime(df["Maturity"])
-    df = df.sort_values(by=["Maturity", "Coupon"])
-    df.index = range(len(df))
-    return df
+    return df.sort_values(by=["Maturity", "Coupon"], ignore_index=True)
 
 
 def treasury_direct_prices(date=None):
@@ -96,25 +112,23 @@ def treasury_direct_prices(date=None):
         url = (
             "https://www.treasurydirect.gov/GA-FI/FedInvest/selectSecurityPriceDate.htm"
         )
-        data = {
-            "priceDate.month": clean_date.month,
-            "priceDate.day": clean_date.day,
-            "priceDate.year": clean_date.year,
-            "submit": "Show Prices",
-        }
-        response = requests.post(url, data=data)
-        assert response.ok
-        table = pd.read_html(response.text)[0]
+        data = (
+            ("priceDate.month", clean_date.month),
+            ("priceDate.day", clean_date.day),
+            ("priceDate.year", clean_date.year),
+            ("submit", "Show Prices"),
+        )
+        table = pd.read_html(io.StringIO(_post_html(url, data)))[0]
 
     df = table
     df["MATURITY DATE"] = pd.to_datetime(df["MATURITY DATE"])
     df["MATURITY"] = (
         df["MATURITY DATE"] - pd.to_datetime(clean_date)
     ) / np.timedelta64(1, "Y")
-    df["COUPON"] = df["RATE"].str[:-1].astype(float)
+    df["COUPON"] = df["RATE"].str.rstrip("%").astype(np.float64)
     df["QUOTE_DATE"] = clean_date
-    for c in ["BUY", "SELL", "END OF DAY"]:
-        df[c] = pd.to_numeric(df[c])
+    price_columns = ["BUY", "SELL", "END OF DAY"]
+    df[price_columns] = df[price_columns].apply(pd.to_numeric)
     df.columns = df.columns.str.replace(" ", "_")
     return df
 
@@ -141,37 +155,48 @@ def cashflows_matrix(treasury_direct_df, quote_date):
             ).max()
         )
     )
-    maturities = np.zeros((len(treasury_direct_df), max_semi_periods))
-    cashflows = maturities.copy()
-
-    for i, row in treasury_direct_df.iterrows():
-        semi_periods = int(np.ceil(row["MATURITY"] / 0.5))
-        if semi_periods == 0:
-            maturities[i - 1, 0] = row["MATURITY"]
-            cashflows[i - 1, 0] = 100
-        else:
-            maturities[i - 1, semi_periods - 1] = row["MATURITY"]
-            maturities[i - 1, : (semi_periods - 1)] = (
-                row["MATURITY"] - (0.5 * np.ones((1, semi_periods - 1))).cumsum()[::-1]
-            )
-            semi_coupon = row["COUPON"] / 2
-            cashflows[i - 1, :semi_periods] = semi_coupon
-            cashflows[i - 1, semi_periods - 1] += 100
+    maturity = treasury_direct_df["MATURITY"].to_numpy(dtype=np.float64)
+    semi_coupon = treasury_direct_df["COUPON"].to_numpy(dtype=np.float64) / 2
+    semi_periods = np.ceil(maturity / 0.5).astype(int)[:, np.newaxis]
+    rows = np.arange(len(treasury_direct_df))
+    # Bills have no coupons so their single cash flow goes in the first column.
+    last = np.maximum(semi_periods[:, 0], 1) - 1
+    columns = np.arange(max_semi_periods)
+    paying = columns < semi_periods
+
+    cashflows = np.where(paying, semi_coupon[:, np.newaxis], 0.0)
+    cashflows[rows, last] += 100
+    maturities = np.where(
+        paying, maturity[:, np.newaxis] - 0.5 * (semi_periods - 1 - columns), 0.0
+    )
+    maturities[rows, last] = maturity
 
     return cashflows, maturities
 
 
+# Quarter ticks encoded by the optional third digit after the apostrophe.
+_QUARTER_TICKS = {"": 0, "0": 0, "2": 1, "5": 2, "7": 3}
+_PRICE_IN_32S = r"^(\d+)'(\d{1,2})([0257]?)$"
+
+
 def to_decimal_price(price_in_32s):
-    partial_tick_value = {0: 0.0, 2: 0.25 / 32, 5: 0.5 / 32, 7: 0.75 / 32}
-    handles_and_fraction = price_in_32s.split("'")
-    handles = int(handles_and_fraction[0])
-    ticks = int(handles_and_fraction[1][:2])
+    apostrophe = price_in_32s.index("'")
+    handles = int(price_in_32s[:apostrophe])
+    ticks = int(price_in_32s[apostrophe + 1 : apostrophe + 3])
     assert ticks < 32
-    partial_ticks = (
-        int(handles_and_fraction[1][2]) if len(handles_and_fraction[1]) > 2 else 0
-    )
-    assert partial_ticks in partial_tick_value.keys()
-    return handles + ticks / 32 + partial_tick_value[partial_ticks]
+    partial_ticks = price_in_32s[apostrophe + 3 :]
+    assert partial_ticks in _QUARTER_TICKS
+    return handles + (ticks + 0.25 * _QUARTER_TICKS[partial_ticks]) / 32
+
+
+def to_decimal_prices(prices_in_32s):
+    parts = pd.Series(prices_in_32s).astype(str).str.extract(_PRICE_IN_32S)
+    assert parts.notna().all(axis=None), "Prices must be formatted as handles'ticks"
+    handles = parts[0].astype(np.int64).to_numpy()
+    ticks = parts[1].astype(np.int64).to_numpy()
+    assert (ticks < 32).all()
+    quarter_ticks = parts[2].map(_QUARTER_TICKS).to_numpy(dtype=np.float64)
+    return handles + (ticks + 0.25 * quarter_ticks) / 32
 
 
 def globex_futures():
@@ -185,7 +210,7 @@ def globex_futures():
     price_columns = ("Last", "Open", "High", "Low")
     mask = df.Code.str.contains("ZT|ZF|ZN|TN|UB|ZB")
     for c in price_columns:
-        df.loc[mask, c] = df.loc[mask, c].apply(to_decimal_price)
+        df.loc[mask, c] = to_decimal_prices(df.loc[mask, c])
 
     df["QUOTE_DATE"] = pd.datetime.today() - BDay(1)
     df["QUOTE_DATE"] = df["QUOTE_DATE"].dt.date
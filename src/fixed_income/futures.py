@@ -1,5 +1,6 @@
+import functools
+
 import numpy as np
-import pandas as pd
 
 MONTHS_IN_QUARTER = 3
 MONTHS_IN_YEAR = 12
@@ -7,77 +8,96 @@ CONVERSION_YIELD = 0.06
 CONVERSION_FV = 1.03
 
 GLOBEX_CODES = ("ZN", "ZB", "UB", "ZT", "TN", "Z3N", "ZF")
+# Deliverable time to maturity ranges as (lower, upper, upper is inclusive).
+DELIVERY_RANGES = {
+    "UB": (25.0, np.inf, False),
+    "ZB": (15.0, 25.0, False),
+    "ZN": (6 + 6 / 12, 10.0, True),
+    "TN": (9 + 5 / 12, 10.0, True),
+    "ZF": (4 + 2 / 12, 5 + 3 / 12, True),
+    "Z3N": (2 + 9 / 12, 5 + 3 / 12, True),
+    "ZT": (1 + 9 / 12, 5 + 3 / 12, True),
+}
 
 
 def _n_and_v(globex_code, year_fraction):
-    mask = np.in1d(globex_code, ("ZN", "ZB", "UB", "TN"))
-    n = mask * np.nan
-    v = mask * np.nan
-    if mask.any():
-        values = (
-            np.floor(year_fraction / MONTHS_IN_QUARTER * MONTHS_IN_YEAR)
-            * MONTHS_IN_QUARTER
-        )
-        n[mask] = values if isinstance(values, float) else values[mask]
-        values = n * (n < 7) + MONTHS_IN_QUARTER * (n >= 7)
-        v[mask] = values if isinstance(values, float) else values[mask]
-
-    mask = np.in1d(globex_code, ("ZT", "Z3N", "ZF"))
-    if mask.any():
-        values = np.floor(year_fraction * MONTHS_IN_YEAR)
-        n[mask] = values if isinstance(values, float) else values[mask]
-        values = n * (n < 7) + (n - 6) * (n >= 7)
-        v[mask] = values if isinstance(values, float) else values[mask]
-
-    if np.isnan(n).all():
+    quarterly = np.isin(globex_code, ("ZN", "ZB", "UB", "TN"))
+    monthly = np.isin(globex_code, ("ZT", "Z3N", "ZF"))
+    if not (quarterly | monthly).any():
         raise NotImplementedError(f"No {globex_code} deliverables found!")
 
+    quarter_months = (
+        np.floor(year_fraction / MONTHS_IN_QUARTER * MONTHS_IN_YEAR) * MONTHS_IN_QUARTER
+    )
+    months = np.floor(year_fraction * MONTHS_IN_YEAR)
+    n = np.where(quarterly, quarter_months, np.where(monthly, months, np.nan))
+    v = np.where(n < 7, n, np.where(quarterly, MONTHS_IN_QUARTER, n - 6))
     return n, v
 
 
 def conversion_factor(globex_code, coupon, time_to_maturity):
+    if np.ndim(globex_code) or np.ndim(coupon) or np.ndim(time_to_maturity):
+        return _conversion_factor(globex_code, coupon, time_to_maturity)
+    return _cached_conversion_factor(
+        str(globex_code), float(coupon), float(time_to_maturity)
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _cached_conversion_factor(globex_code, coupon, time_to_maturity):
+    """Scalar factors are memoized since the same deliverables get repriced"""
+    return _conversion_factor(globex_code, coupon, time_to_maturity)
+
+
+conversion_factor.cache_clear = _cached_conversion_factor.cache_clear
+
+
+def _conversion_factor(globex_code, coupon, time_to_maturity):
+    globex_code = np.asarray(globex_code)
+    coupon = np.asarray(coupon, dtype=np.float64)
+    time_to_maturity = np.asarray(time_to_maturity, dtype=np.float64)
     years = np.floor(time_to_maturity)
     year_fraction = time_to_maturity - years
     n, v = _n_and_v(globex_code, year_fraction)
-    a = 1 / pow(CONVERSION_FV, v / 6)
+    a = np.power(CONVERSION_FV, -v / 6)
     b = (coupon / 2) * (6 - v) / 6
-    c = 1 / pow(CONVERSION_FV, 2 * years + 1 * (n >= 7))
+    c = np.power(CONVERSION_FV, -(2 * years + (n >= 7)))
     d = (coupon / CONVERSION_YIELD) * (1 - c)
 
     factor = a * (coupon / 2 + c + d) - b
-    return factor if factor.size > 1 else float(factor)
+    return factor if factor.ndim else factor.item()
 
 
 def extract_deliverables(df):
-    deliverables = []
-    for code in GLOBEX_CODES:
-        tmp_df = df[find_deliverables_of(code, df.MATURITY)].copy()
-        tmp_df["DELIVERABLE"] = code
-        tmp_df["CONV_FACTOR"] = conversion_factor(
-            tmp_df.DELIVERABLE, tmp_df.COUPON / 100, tmp_df.MATURITY
-        )
-        deliverables.append(tmp_df)
+    is_deliverable = _deliverable_matrix(GLOBEX_CODES, df.MATURITY)
+    code_index, row_index = np.nonzero(is_deliverable)
 
-    deliverables = pd.concat(deliverables)
+    deliverables = df.iloc[row_index].copy()
+    deliverables["DELIVERABLE"] = np.asarray(GLOBEX_CODES)[code_index]
+    deliverables["CONV_FACTOR"] = (
+        conversion_factor(
+            deliverables.DELIVERABLE, deliverables.COUPON / 100, deliverables.MATURITY
+        )
+        if len(deliverables)
+        else np.nan
+    )
     deliverables.index = np.arange(len(deliverables))
     return deliverables
 
 
+def _deliverable_matrix(globex_codes, time_to_maturity):
+    """Boolean matrix of shape (codes, maturities) flagging deliverable pairs"""
+    tau = np.asarray(time_to_maturity, dtype=np.float64)
+    try:
+        lower, upper, inclusive = (
+            np.reshape(bound, (-1,) + (1,) * tau.ndim)
+            for bound in zip(*(DELIVERY_RANGES[code] for code in globex_codes))
+        )
+    except KeyError as e:
+        raise NotImplementedError(f"{e.args[0]} not supported!")
+    below_upper = np.where(inclusive, tau <= upper, tau < upper)
+    return (lower <= tau) & below_upper
+
+
 def find_deliverables_of(globex_code, time_to_maturity):
-    tau = np.array(time_to_maturity)
-    if globex_code == "UB":
-        return tau >= 25.0
-    elif globex_code == "ZB":
-        return (15.0 <= tau) & (tau < 25.0)
-    elif globex_code == "ZN":
-        return (6 + 6 / 12 <= tau) & (tau <= 10.0)
-    elif globex_code == "TN":
-        return (9 + 5 / 12 <= tau) & (tau <= 10.0)
-    elif globex_code == "ZF":
-        return (4 + 2 / 12 <= tau) & (tau <= 5 + 3 / 12)
-    elif globex_code == "Z3N":
-        return (2 + 9 / 12 <= tau) & (tau <= 5 + 3 / 12)
-    elif globex_code == "ZT":
-        return (1 + 9 / 12 <= tau) & (tau <= 5 + 3 / 12)
-    else:
-        raise NotImplementedError(f"{globex_code} not supported!")
+    return _deliverable_matrix((globex_code,), time_to_maturity)[0]
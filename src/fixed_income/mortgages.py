@@ -1,3 +1,5 @@
+import math
+
 import numpy as np
 import pandas as pd
 
@@ -7,8 +9,22 @@ __all__ = ["payments"]
 def coupon(loan, maturity, mortgage_rate, freq=1):
     dt = 1 / freq
     periods = maturity * freq
-    discount = 1 / (1 + mortgage_rate * dt)
-    return loan * (1 / discount - 1) / (1 - pow(discount, periods))
+    period_rate = mortgage_rate * dt
+    if np.ndim(period_rate) or np.ndim(periods):
+        return loan / _annuity_factor(period_rate, periods)
+    if period_rate == 0:
+        return loan / periods
+    return loan * period_rate / -math.expm1(-periods * math.log1p(period_rate))
+
+
+def _annuity_factor(period_rates, periods):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        factor = -np.expm1(-periods * np.log1p(period_rates)) / period_rates
+    # Zero rates give 0 / 0, where the factor is just the number of periods.
+    factor = np.where(period_rates == 0, periods, factor)
+    if isinstance(period_rates, pd.Series):
+        return pd.Series(factor, index=period_rates.index)
+    return factor
 
 
 def payments(loan, maturity, mortgage_rate, freq=1):
@@ -16,19 +32,19 @@ def payments(loan, maturity, mortgage_rate, freq=1):
     periods = np.arange(0, int(maturity / dt) + 1)
     payment_times = periods * dt
 
-    discounts = (1 + mortgage_rate * dt) ** -periods
-    discounts[0] = 0
-
     payment = coupon(loan, maturity, mortgage_rate, freq)
 
-    balance = 0 * payment_times
-    balance[0] = loan
-    interest = 0 * payment_times
-    amounts = 0 * payment_times
-    for i in periods[1:]:
-        amounts[i] = payment
-        interest[i] = balance[i - 1] * mortgage_rate * dt
-        balance[i] = balance[i - 1] - payment + interest[i]
+    period_rate = mortgage_rate * dt
+    if period_rate == 0:
+        balance = loan - payment * periods
+    else:
+        log_growth = periods * np.log1p(period_rate)
+        growth = np.exp(log_growth)
+        balance = loan * growth - payment * np.expm1(log_growth) / period_rate
+    interest = np.zeros_like(payment_times)
+    interest[1:] = balance[:-1] * period_rate
+    amounts = np.full_like(payment_times, payment)
+    amounts[0] = 0
     return (
         pd.DataFrame()
         .assign(time=payment_times)
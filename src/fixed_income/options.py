@@ -1,13 +1,12 @@
 import numpy as np
-from scipy.stats import norm
+from scipy.special import ndtr
 
 
 def black_option(forward, strike, discount_factor, sigma, maturity, is_call=True):
-    d1 = (np.log(forward / strike) + sigma ** 2 * maturity / 2) / (
-        sigma * np.sqrt(maturity)
-    )
-    d2 = d1 - sigma * np.sqrt(maturity)
+    total_vol = sigma * np.sqrt(maturity)
+    d1 = np.log(forward / strike) / total_vol + total_vol / 2
+    d2 = d1 - total_vol
     if is_call:
-        return discount_factor * (forward * norm.cdf(d1) - strike * norm.cdf(d2))
+        return discount_factor * (forward * ndtr(d1) - strike * ndtr(d2))
     else:
-        return discount_factor * (-forward * norm.cdf(-d1) + strike * norm.cdf(-d2))
+        return discount_factor * (-forward * ndtr(-d1) + strike * ndtr(-d2))
@@ -11,11 +11,11 @@ def fit(df):
         .assign(Slope=pca.components_[1, :])
         .assign(Curvature=pca.components_[2, :])
     )
-    factors = (
-        pd.DataFrame()
-        .assign(Level=(df * loadings.Level).sum(axis=1))
-        .assign(Slope=(df * loadings.Slope).sum(axis=1))
-        .assign(Curvature=(df * loadings.Curvature).sum(axis=1))
+    # Project the raw data rather than use pca.transform, which would de-mean it.
+    factors = pd.DataFrame(
+        df.to_numpy() @ pca.components_.T,
+        index=df.index,
+        columns=loadings.columns,
     )
     factors = factors.cumsum(axis=0)
     return pca, loadings, factors
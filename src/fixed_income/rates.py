@@ -7,27 +7,45 @@ from scipy import interpolate
 
 __all__ = [
     "compute_days_between",
+    "compute_days_between_vec",
     "treasury_bill_price",
     "bond_equivalent_yield",
     "discount_factor_from",
+    "discount_factor_from_vec",
     "spot_rate_from",
+    "spot_rate_from_vec",
     "forward_rate_from",
 ]
 
 
 def compute_days_between(start_date, end_date):
-    """Computes number of days between dates"""
+    """Computes number of days between dates, elementwise for array inputs"""
+    if np.ndim(start_date) or np.ndim(end_date):
+        return compute_days_between_vec(start_date, end_date)
     time_delta = Timestamp(end_date) - Timestamp(start_date)
     return time_delta.days
 
 
+def _to_datetime64(dates):
+    dates = np.asarray(dates)
+    parsed = pd.to_datetime(dates.ravel(), cache=True).to_numpy()
+    return parsed.reshape(dates.shape)
+
+
+def compute_days_between_vec(start_dates, end_dates):
+    """Computes number of days between arrays of dates as int64"""
+    time_deltas = _to_datetime64(end_dates) - _to_datetime64(start_dates)
+    return (time_deltas // np.timedelta64(1, "D")).astype(np.int64)
+
+
 def treasury_bill_price(discount_yield, days_to_maturity):
-    """Computes price ot treasury bill"""
+    """Computes price ot treasury bill, elementwise for array inputs"""
     return 100 * (1 - days_to_maturity / 360 * discount_yield)
 
 
 def bond_equivalent_yield(discount_yield, days_to_maturity):
-    """Computes bond equivalent yield from treasury bill discount yield"""
+    """Computes bond equivalent yield from treasury bill discount yield, elementwise
+    for array inputs"""
     return 365 * discount_yield / (360 - discount_yield * days_to_maturity)
 
 
@@ -42,16 +60,16 @@ def discount_factor_from(spot_rate, term, freq=math.inf):
 
     Parameters
     ----------
-    spot_rate : float
+    spot_rate : float or array_like
         The spot rate
-    term : float
+    term : float or array_like
         The term or time to maturity
     freq : int or math.inf, optional
         The compounding frequency, default is math.inf which results in continuous compounding rates.
 
     Returns
     -------
-    float
+    float or numpy.ndarray
         The discount factor determined the spot rate.
 
     Raises
@@ -60,6 +78,8 @@ def discount_factor_from(spot_rate, term, freq=math.inf):
         If freq is not math.inf of positive int
 
     """
+    if np.ndim(spot_rate) or np.ndim(term):
+        return discount_factor_from_vec(spot_rate, term, freq)
     if freq == math.inf:
         return math.exp(-spot_rate * term)
     elif is_valid_freq(freq):
@@ -68,6 +88,41 @@ def discount_factor_from(spot_rate, term, freq=math.inf):
         raise ValueError("Freq must be math.inf or positive int")
 
 
+def discount_factor_from_vec(spot_rates, terms, freq=math.inf):
+    """Computes discount factors from arrays of spot rates
+
+    Elementwise version of discount_factor_from for arrays of spot rates and terms.
+
+    Parameters
+    ----------
+    spot_rates : array_like
+        The spot rates
+    terms : array_like
+        The terms or times to maturity, broadcast against spot_rates
+    freq : int or math.inf, optional
+        The compounding frequency, default is math.inf which results in continuous compounding rates.
+
+    Returns
+    -------
+    numpy.ndarray
+        The discount factors determined by the spot rates.
+
+    Raises
+    ------
+    ValueError
+        If freq is not math.inf of positive int
+
+    """
+    spot_rates = np.asarray(spot_rates, dtype=np.float64)
+    terms = np.asarray(terms, dtype=np.float64)
+    if freq == math.inf:
+        return np.exp(-spot_rates * terms)
+    elif is_valid_freq(freq):
+        return np.exp(-freq * terms * np.log1p(spot_rates / freq))
+    else:
+        raise ValueError("Freq must be math.inf or positive int")
+
+
 def spot_rate_from(discount_factor, term, freq=math.inf):
     """Computes spot rate from discount factor
 
@@ -75,16 +130,16 @@ def spot_rate_from(discount_factor, term, freq=math.inf):
 
     Parameters
     ----------
-    discount_factor : float or pandas.Series
+    discount_factor : float, array_like or pandas.Series
         The discount factor to determine the spot rate.
-    term : float
+    term : float or array_like
         The term or time to maturity
     freq : int or math.inf, optional
         The compounding frequency, default is math.inf which results in continuous compounding rates.
 
     Returns
     -------
-    float or pandas.Series
+    float, numpy.ndarray or pandas.Series
         The spot rate
 
     Raises
@@ -93,17 +148,57 @@ def spot_rate_from(discount_factor, term, freq=math.inf):
         If freq is not math.inf of positive int
 
     """
+    if isinstance(discount_factor, pd.Series):
+        return pd.Series(
+            spot_rate_from_vec(discount_factor, term, freq),
+            index=discount_factor.index,
+            name=discount_factor.name,
+        )
+    if np.ndim(discount_factor) or np.ndim(term):
+        return spot_rate_from_vec(discount_factor, term, freq)
     if freq == math.inf:
-        package = math
-        if isinstance(discount_factor, pd.Series):
-            package = np
-        return -1 / term * package.log(discount_factor)
+        return -1 / term * math.log(discount_factor)
     elif is_valid_freq(freq):
         return freq * (math.pow(discount_factor, -1 / (freq * term)) - 1)
     else:
         raise ValueError("Freq must be math.inf or positive int")
 
 
+def spot_rate_from_vec(discount_factors, terms, freq=math.inf):
+    """Computes spot rates from arrays of discount factors
+
+    Elementwise version of spot_rate_from for arrays of discount factors and terms.
+
+    Parameters
+    ----------
+    discount_factors : array_like
+        The discount factors to determine the spot rates.
+    terms : array_like
+        The terms or times to maturity, broadcast against discount_factors
+    freq : int or math.inf, optional
+        The compounding frequency, default is math.inf which results in continuous compounding rates.
+
+    Returns
+    -------
+    numpy.ndarray
+        The spot rates
+
+    Raises
+    ------
+    ValueError
+        If freq is not math.inf of positive int
+
+    """
+    discount_factors = np.asarray(discount_factors, dtype=np.float64)
+    terms = np.asarray(terms, dtype=np.float64)
+    if freq == math.inf:
+        return -np.log(discount_factors) / terms
+    elif is_valid_freq(freq):
+        return freq * (np.power(discount_factors, -1 / (freq * terms)) - 1)
+    else:
+        raise ValueError("Freq must be math.inf or positive int")
+
+
 def forward_rate_from(rate_1, term_1, rate_2, term_2, freq=math.inf):
     """Computes forward rate from pair of spot rates
 
@@ -145,25 +240,26 @@ def forward_rate_from(rate_1, term_1, rate_2, term_2, freq=math.inf):
         raise ValueError("Freq must be math.inf or positive int")
 
 
-def interp_rates(rates, maturities=None, column="Rate"):
+def build_interpolator(rates, column="Rate"):
     assert "Maturity" in rates.columns
     assert column in rates.columns
-    sorted_rates = rates.sort_values("Maturity")
+    known_maturities = rates["Maturity"].to_numpy(dtype=np.float64)
+    known_rates = rates[column].to_numpy(dtype=np.float64)
+    order = np.argsort(known_maturities, kind="stable")
+    return interpolate.Akima1DInterpolator(known_maturities[order], known_rates[order])
 
-    interpolator = interpolate.Akima1DInterpolator(
-        sorted_rates["Maturity"], sorted_rates[column]
-    )
+
+def interp_at(interpolator, maturities=None, column="Rate"):
     if maturities is None:
         maturities = np.arange(0.25, 7.25, 0.25)
-    interpolated_rates = interpolator(maturities)
-
-    index = pd.Series(data=maturities, name="Maturity")
-    interpolated_rates = pd.Series(
-        data=interpolated_rates, name=f"Interpolated {column}", index=index
+    maturities = np.asarray(maturities, dtype=np.float64)
+    return pd.DataFrame(
+        {"Maturity": maturities, f"Interpolated {column}": interpolator(maturities)}
     )
-    interpolated_rates = pd.DataFrame(interpolated_rates).reset_index()
 
-    return interpolated_rates
+
+def interp_rates(rates, maturities=None, column="Rate"):
+    return interp_at(build_interpolator(rates, column), maturities, column)
 
 
 def add_libor_curve(rates, first_swap_maturity, delta=0.25):
@@ -175,9 +271,13 @@ def add_libor_curve(rates, first_swap_maturity, delta=0.25):
     zeros[idx] = 1 / (
         1 + rates.loc[idx, "Maturity"] * rates.loc[idx, "Interpolated Rate"]
     )
-    for i in range(sum(idx), len(zeros)):
-        rate = rates["Interpolated Rate"][i]
-        zeros[i] = (1 - rate * delta * np.sum(zeros[:i])) / (1 + rate * delta)
+    interpolated_rates = rates["Interpolated Rate"].to_numpy(dtype=np.float64)
+    start = int(idx.sum())
+    annuity = zeros[:start].sum()
+    for i in range(start, len(zeros)):
+        rate = interpolated_rates[i]
+        zeros[i] = (1 - rate * delta * annuity) / (1 + rate * delta)
+        annuity += zeros[i]
 
     rates["Zero"] = zeros
     rates["Spot Rate"] = -1 / rates["Maturity"] * np.log(zeros)
@@ -191,19 +291,49 @@ def add_short_rates(rates, time_step):
     rates["Short Rate"] = 1 / time_step * (1 / rates["Zero"] - 1)
 
 
+def _forward_discounts(zeros, start_maturity):
+    # Same as dividing by Series.shift(start_maturity), including negative shifts.
+    shifted = np.full_like(zeros, np.nan)
+    if start_maturity >= 0:
+        shifted[start_maturity:] = zeros[: max(len(zeros) - start_maturity, 0)]
+    else:
+        shifted[:start_maturity] = zeros[-start_maturity:]
+    return zeros / shifted
+
+
+def _forward_rates(forward_discounts, maturities):
+    return (1 / forward_discounts - 1) / np.diff(maturities, prepend=np.nan)
+
+
 def add_forward_discounts(rates, start_maturity=1):
     assert "Maturity" in rates.columns
     assert "Zero" in rates.columns
-    rates["Forward Discount"] = rates["Zero"] / rates["Zero"].shift(start_maturity)
+    rates["Forward Discount"] = _forward_discounts(
+        rates["Zero"].to_numpy(dtype=np.float64), start_maturity
+    )
     return rates
 
 
 def add_forward_rates(rates):
     assert "Maturity" in rates.columns
     assert "Forward Discount" in rates.columns
-    rates["Forward Rate"] = (1 / rates["Forward Discount"] - 1) / rates[
-        "Maturity"
-    ].diff()
+    rates["Forward Rate"] = _forward_rates(
+        rates["Forward Discount"].to_numpy(dtype=np.float64),
+        rates["Maturity"].to_numpy(dtype=np.float64),
+    )
+    return rates
+
+
+def add_forward_discounts_and_rates(rates, start_maturity=1):
+    assert "Maturity" in rates.columns
+    assert "Zero" in rates.columns
+    forward_discounts = _forward_discounts(
+        rates["Zero"].to_numpy(dtype=np.float64), start_maturity
+    )
+    rates["Forward Discount"] = forward_discounts
+    rates["Forward Rate"] = _forward_rates(
+        forward_discounts, rates["Maturity"].to_numpy(dtype=np.float64)
+    )
     return rates
 
 
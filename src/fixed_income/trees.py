@@ -1,58 +1,73 @@
+import math
+
 import numpy as np
-from scipy.optimize import minimize
+from scipy.optimize import brentq
 
 __all__ = ["ho_lee", "simple_bdt", "fit", "bond_price"]
 
 
-def initialize_tree(maturity, time_step, is_zero):
+def initialize_tree(maturity, time_step, is_zero, dtype=np.float64):
     size = int(maturity / time_step)
     if is_zero:
-        return np.zeros((size + 1, size + 1, size))
-    return np.zeros((size, size))
+        return np.zeros((size + 1, size + 1, size), dtype=dtype)
+    return np.zeros((size, size), dtype=dtype)
 
 
 def backfill(rate_tree, period, time_step):
     zero_maturity = period + 2
-    zero_tree = np.zeros((zero_maturity, zero_maturity))
+    zero_tree = np.zeros((zero_maturity, zero_maturity), dtype=rate_tree.dtype)
     zero_tree[:, -1] = 1
     pi = 0.5
+    # One exp over the whole triangle instead of a ufunc call per time step.
+    discounts = pi * np.exp(-rate_tree[: period + 1, : period + 1] * time_step)
     for j in range(period + 1, 0, -1):
-        discount = np.exp(-rate_tree[:j, j - 1] * time_step)
-        zero_tree[:j, j - 1] = (
-            discount * pi * (zero_tree[:j, j] + zero_tree[1 : j + 1, j])
+        zero_tree[:j, j - 1] = discounts[:j, j - 1] * (
+            zero_tree[:j, j] + zero_tree[1 : j + 1, j]
         )
     return zero_tree
 
 
 def ho_lee(theta, rate_tree, period, sigma, time_step):
-    rate_tree[0, period] = (
-        rate_tree[0, period - 1] + theta * time_step + sigma * np.sqrt(time_step)
-    )
-    for i in range(1, period + 1):
-        rate_tree[i, period] = (
-            rate_tree[i - 1, period - 1]
-            + theta * time_step
-            - sigma * np.sqrt(time_step)
-        )
+    drift = theta * time_step
+    shock = sigma * math.sqrt(time_step)
+    up, down = drift + shock, drift - shock
+    rate_tree[0, period] = rate_tree[0, period - 1] + up
+    rate_tree[1 : period + 1, period] = rate_tree[:period, period - 1] + down
 
     return rate_tree, backfill(rate_tree, period, time_step)
 
 
 def simple_bdt(theta, rate_tree, period, sigma, time_step):
-    rate_tree[0, period] = rate_tree[0, period - 1] * np.exp(
-        theta * time_step + sigma * np.sqrt(time_step)
-    )
-    for i in range(1, rate_tree.shape[0]):
-        rate_tree[i, period] = rate_tree[i - 1, period - 1] * np.exp(
-            theta * time_step - sigma * np.sqrt(time_step)
-        )
+    drift = theta * time_step
+    shock = sigma * math.sqrt(time_step)
+    up, down = math.exp(drift + shock), math.exp(drift - shock)
+    rate_tree[0, period] = rate_tree[0, period - 1] * up
+    rate_tree[1:, period] = rate_tree[:-1, period - 1] * down
 
     return rate_tree, backfill(rate_tree, period, time_step)
 
 
-def error(theta, zero, model, rate_tree, period, sigma, time_step):
+def residual(theta, zero, model, rate_tree, period, sigma, time_step):
     _, zero_tree = model(theta, rate_tree, period, sigma, time_step)
-    return (zero - zero_tree[0, 0]) ** 2
+    return zero - zero_tree[0, 0]
+
+
+def solve_theta(zero, model, rate_tree, period, sigma, time_step, guess=0.0):
+    if model is ho_lee:
+        # Theta shifts every rate in the new column by theta * dt, which scales
+        # the backfilled root zero by exp(-theta * dt ** 2).
+        _, zero_tree = model(0.0, rate_tree, period, sigma, time_step)
+        return np.log(zero_tree[0, 0] / zero) / time_step ** 2
+    args = (zero, model, rate_tree, period, sigma, time_step)
+    # Start from a one step diffusion bracket around the guess and widen it
+    # until the residual changes sign.
+    width = sigma * math.sqrt(time_step) or 0.1
+    for _ in range(10):
+        lower, upper = guess - width, guess + width
+        if residual(lower, *args) * residual(upper, *args) <= 0:
+            break
+        width *= 2
+    return brentq(residual, lower, upper, args=args, xtol=1e-10)
 
 
 def fit(model, zeros, sigma, time_step):
@@ -66,17 +81,14 @@ def fit(model, zeros, sigma, time_step):
     zero_tree[:2, 1, 0] = 1
 
     thetas = np.zeros(zeros.shape)
-    errors = np.zeros(zeros.shape)
+    theta = 0.0
 
+    # Models only write column ``period`` and read the earlier, already fitted
+    # columns, so every evaluation can share one rate tree without copying it.
+    # Theta moves little between periods, so each solve starts from the last.
     for i, zero in enumerate(zeros[1:], start=1):
-        result = minimize(
-            error,
-            x0=[0],
-            args=(zero, model, rate_tree.copy(), i, sigma, time_step),
-            method="powell",
-        )
-        thetas[i - 1] = result.x
-        errors[i - 1] = result.fun
+        theta = solve_theta(zero, model, rate_tree, i, sigma, time_step, theta)
+        thetas[i - 1] = theta
         rate_tree, z_tree = model(thetas[i - 1], rate_tree, i, sigma, time_step)
         zero_tree[: i + 2, : i + 2, i] = z_tree
 
@@ -86,31 +98,33 @@ def fit(model, zeros, sigma, time_step):
 
 def bond_price(rate_tree, coupon, maturity, time_step):
     size = int(maturity / time_step)
-    bond_tree = np.zeros((size + 1, size + 1))
+    # Induction walks the trees a column at a time, so store them column major
+    # and update each column in place without temporaries.
+    bond_tree = np.zeros((size + 1, size + 1), dtype=rate_tree.dtype, order="F")
     bond_tree[:, -1] = 100
     pi = 0.5
+    coupon_payment = coupon * time_step
+    discounts = np.asfortranarray(np.exp(-rate_tree[:size, :size] * time_step))
 
     for j in range(size, 0, -1):
-        discount = np.exp(-rate_tree[:j, j - 1] * time_step)
-        bond_tree[:j, j - 1] = discount * (
-            pi * (bond_tree[:j, j] + bond_tree[1 : j + 1, j]) + coupon * time_step
-        )
+        column = bond_tree[:j, j - 1]
+        np.add(bond_tree[:j, j], bond_tree[1 : j + 1, j], out=column)
+        column *= pi
+        column += coupon_payment
+        column *= discounts[:j, j - 1]
     return bond_tree
 
 
 def call_price(rate_tree, bond_tree, strike, maturity, time_step, first_time_call):
     size = int(maturity / time_step)
-    call_tree = np.zeros((size + 1, size + 1))
+    call_tree = np.zeros((size + 1, size + 1), dtype=rate_tree.dtype)
     call_tree[:, -1] = bond_tree[:, -1] - strike
     pi = 0.5
+    discounts = pi * np.exp(-rate_tree[:size, :size] * time_step)
 
     for j in range(size, 0, -1):
-        discount = np.exp(-rate_tree[:j, j - 1] * time_step)
-        call_tree[:j, j - 1] = (
-            discount * pi * (call_tree[:j, j] + call_tree[1 : j + 1, j])
-        )
+        column = call_tree[:j, j - 1]
+        column[:] = discounts[:j, j - 1] * (call_tree[:j, j] + call_tree[1 : j + 1, j])
         if (j - 1) * time_step >= first_time_call:
-            call_tree[:j, j - 1] = np.max(
-                [call_tree[:j, j - 1], bond_tree[:j, j - 1] - strike], axis=0
-            )
+            np.maximum(column, bond_tree[:j, j - 1] - strike, out=column)
     return call_tree
@@ -1,6 +1,9 @@
 import re
 
+_WORD_START = re.compile("(.)([A-Z][a-z]+)")
+_LOWER_TO_UPPER = re.compile("([a-z0-9])([A-Z])")
+
 
 def camel_to_snake(phrase):
-    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", phrase)
-    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+    s1 = _WORD_START.sub(r"\1_\2", phrase)
+    return _LOWER_TO_UPPER.sub(r"\1_\2", s1).lower()
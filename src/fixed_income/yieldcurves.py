@@ -1,35 +1,97 @@
+import functools
+
 import numpy as np
 import pandas as pd
 from scipy.optimize import minimize
 
+from fixed_income import bonds
+
 __all__ = ["NelsonSiegel", "Vasicek"]
 
 
+def _inverse(maturities):
+    inverse_maturities = np.zeros_like(maturities)
+    np.divide(1.0, maturities, out=inverse_maturities, where=maturities != 0)
+    return inverse_maturities
+
+
 def nelson_siegel(theta0, theta1, theta2, kappa, maturities):
-    inverse_maturities = 1.0 / maturities
-    inverse_maturities[inverse_maturities == np.inf] = 0
-    yields = np.zeros(maturities.shape)
+    maturities = np.asarray(maturities, dtype=np.float64)
+    decay = np.exp(-maturities / kappa)
+    return _nelson_siegel(theta0, theta1, theta2, kappa, _inverse(maturities), decay)
+
+
+def _nelson_siegel(theta0, theta1, theta2, kappa, inverse_maturities, decay):
+    yields = 1 - decay
+    yields *= inverse_maturities
+    yields *= (theta1 + theta2) * kappa
+    yields -= theta2 * decay
     yields += theta0
-    yields += (
-        (theta1 + theta2)
-        * (1 - np.exp(-maturities / kappa))
-        * inverse_maturities
-        * kappa
-    )
-    yields -= theta2 * np.exp(-maturities / kappa)
     return yields
 
 
+def _zero_padding(*arrays):
+    """Zero every cell that is NaN in any of the aligned arrays"""
+    # Ragged tables pad with NaN, which the row sums skip.
+    arrays = [np.asarray(array, dtype=np.float64) for array in arrays]
+    missing = functools.reduce(np.logical_or, map(np.isnan, arrays))
+    if not missing.any():
+        return arrays
+    return [np.where(missing, 0.0, array) for array in arrays]
+
+
 def price(cashflows, zeros):
     if isinstance(cashflows, pd.Series) and isinstance(zeros, pd.Series):
         return (cashflows * zeros).sum()
-    return (cashflows * zeros).sum(axis=1)
+    prices = bonds.price_from_cashflows(cashflows, zeros)
+    if np.isnan(prices).any():
+        prices = bonds.price_from_cashflows(*_zero_padding(cashflows, zeros))
+    if isinstance(cashflows, pd.DataFrame):
+        return pd.Series(prices, index=cashflows.index)
+    return prices
 
 
 def price_error(real_prices, fitted_prices):
     return ((real_prices - fitted_prices) ** 2).sum()
 
 
+def _residuals(real_prices, fitted_prices):
+    residuals = real_prices - fitted_prices
+    if isinstance(residuals, pd.Series) and isinstance(fitted_prices, pd.Series):
+        residuals = residuals.reindex(fitted_prices.index)
+    return np.asarray(residuals, dtype=np.float64)
+
+
+def _fit_arrays(real_prices, cashflows, maturities):
+    """Align curve fit inputs once and convert them to float arrays"""
+    maturities = np.asarray(maturities, dtype=np.float64)
+    if isinstance(real_prices, pd.Series) and isinstance(cashflows, pd.DataFrame):
+        # Match price_error's label alignment, where unmatched bonds drop out.
+        keep = cashflows.index.isin(real_prices.index)
+        real_prices = real_prices.reindex(cashflows.index[keep])
+        cashflows = cashflows[keep]
+        if maturities.ndim == 2:
+            maturities = maturities[keep]
+    real_prices = np.asarray(real_prices, dtype=np.float64)
+    cashflows = np.asarray(cashflows, dtype=np.float64)
+    # Missing quotes drop out and missing cash flows count as zero, as the
+    # skipna pandas sums did, so the objective never sees a NaN.
+    quoted = ~np.isnan(real_prices)
+    if not quoted.all():
+        real_prices, cashflows = real_prices[quoted], cashflows[quoted]
+        if maturities.ndim == 2:
+            maturities = maturities[quoted]
+    missing = np.isnan(cashflows) | np.isnan(maturities)
+    if missing.any():
+        cashflows = np.where(missing, 0.0, cashflows)
+        maturities = np.where(missing, 0.0, maturities)
+    return real_prices, cashflows, maturities
+
+
+def _uses_gradient(method):
+    return method.lower() not in ("powell", "nelder-mead")
+
+
 def ns_error(x, real_prices, cashflows, maturities):
     yields = nelson_siegel(*x, maturities=maturities)
     zeros = np.exp(-maturities * yields)
@@ -37,11 +99,56 @@ def ns_error(x, real_prices, cashflows, maturities):
     return price_error(real_prices, fitted_prices)
 
 
-def ns_fit(real_prices, cashflows, maturities, x0=None):
-    x0 = x0 if x0 is not None else [0.0, 0.0, 0.0, 1.0]
-    return minimize(
-        ns_error, x0, args=(real_prices, cashflows, maturities), method="powell"
+def ns_error_grad(x, real_prices, cashflows, maturities):
+    """Gradient of ns_error with respect to (theta0, theta1, theta2, kappa)"""
+    theta0, theta1, theta2, kappa = x
+    maturities = np.asarray(maturities, dtype=np.float64)
+    inverse_maturities = _inverse(maturities)
+    decay = np.exp(-maturities / kappa)
+    yields = _nelson_siegel(theta0, theta1, theta2, kappa, inverse_maturities, decay)
+    zeros = np.exp(-maturities * yields)
+    fitted_prices = price(cashflows, zeros)
+
+    slope = kappa * (1 - decay) * inverse_maturities
+    yield_grads = (
+        np.ones_like(maturities),
+        slope,
+        slope - decay,
+        (theta1 + theta2) * (slope - decay * maturities * inverse_maturities) / kappa
+        - theta2 * decay * maturities / pow(kappa, 2),
     )
+    residuals = _residuals(real_prices, fitted_prices)[:, np.newaxis]
+    weights = 2 * residuals * np.asarray(cashflows) * maturities * zeros
+    return np.array([np.sum(weights * g) for g in yield_grads])
+
+
+def ns_fit(real_prices, cashflows, maturities, x0=None, method="L-BFGS-B"):
+    x0 = x0 if x0 is not None else [0.0, 0.0, 0.0, 1.0]
+    real_prices, cashflows, maturities = _fit_arrays(real_prices, cashflows, maturities)
+    inverse_maturities = _inverse(maturities)
+    # Powell line searches mostly hold kappa fixed, so reuse exp(-m / kappa).
+    cache = {"kappa": None, "decay": None}
+
+    def error(x):
+        theta0, theta1, theta2, kappa = x
+        if kappa != cache["kappa"]:
+            cache["kappa"] = kappa
+            cache["decay"] = np.exp(-maturities / kappa)
+        yields = _nelson_siegel(
+            theta0, theta1, theta2, kappa, inverse_maturities, cache["decay"]
+        )
+        fitted_prices = price(cashflows, np.exp(-maturities * yields))
+        return price_error(real_prices, fitted_prices)
+
+    jac = None
+    if _uses_gradient(method):
+        jac = functools.partial(
+            ns_error_grad,
+            real_prices=real_prices,
+            cashflows=cashflows,
+            maturities=maturities,
+        )
+    return minimize(error, x0, method=method, jac=jac, tol=1e-12)
 
 
 def forwards(df):
@@ -74,8 +181,11 @@ class NelsonSiegel:
             .set_index("Maturity")
         )
 
-    def price(self, cashflows, cashflow_maturities):
-        return price(cashflows, self.zeros(cashflow_maturities))
+    def _zeros_or(self, zeros, maturities):
+        return self.zeros(maturities) if zeros is None else zeros
+
+    def price(self, cashflows, cashflow_maturities, zeros=None):
+        return price(cashflows, self._zeros_or(zeros, cashflow_maturities))
 
     def yields(self, maturities):
         return nelson_siegel(
@@ -85,32 +195,63 @@ class NelsonSiegel:
     def zeros(self, maturities):
         return np.exp(-maturities * self.yields(maturities))
 
-    def delta(self, cashflows, cashflow_maturities):
-        zeros = self.zeros(cashflow_maturities)
+    def delta(self, cashflows, cashflow_maturities, zeros=None):
+        zeros = self._zeros_or(zeros, cashflow_maturities)
         return price(cashflows, zeros * cashflow_maturities)
 
-    def duration(self, cashflows, cashflow_maturities):
-        return self.delta(cashflows, cashflow_maturities) / self.price(
-            cashflows, cashflow_maturities
-        )
-
-    def gamma(self, cashflows, cashflow_maturities):
+    def _maturity_moment(self, cashflows, cashflow_maturities, zeros, order):
+        """Present value weighted mean of the cash flow maturities to the order"""
+        index = cashflows.index if isinstance(cashflows, pd.DataFrame) else None
+        maturities = np.asarray(cashflow_maturities, dtype=np.float64)
+        zeros = self._zeros_or(zeros, maturities)
+        cashflows, zeros, maturities = _zero_padding(cashflows, zeros, maturities)
+        present_values = cashflows * zeros
+        # Normalize first so a single cash flow weighs exactly one.
+        weights = present_values / present_values.sum(axis=-1, keepdims=True)
+        moments = bonds.price_from_cashflows(weights, np.power(maturities, order))
+        return moments if index is None else pd.Series(moments, index=index)
+
+    def duration(self, cashflows, cashflow_maturities, zeros=None):
+        return self._maturity_moment(cashflows, cashflow_maturities, zeros, 1)
+
+    def gamma(self, cashflows, cashflow_maturities, zeros=None):
+        zeros = self._zeros_or(zeros, cashflow_maturities)
+        return price(cashflows, zeros * np.square(cashflow_maturities))
+
+    def convexity(self, cashflows, cashflow_maturities, zeros=None):
+        return self._maturity_moment(cashflows, cashflow_maturities, zeros, 2)
+
+    def risk_report(self, cashflows, cashflow_maturities):
         zeros = self.zeros(cashflow_maturities)
-        return price(cashflows, zeros * pow(cashflow_maturities, 2))
-
-    def convexity(self, cashflows, cashflow_maturities):
-        return self.gamma(cashflows, cashflow_maturities) / self.price(
-            cashflows, cashflow_maturities
-        )
+        value = price(cashflows, zeros)
+        # Reuse the duration weights zeros * m to form the convexity weights.
+        weighted_zeros = zeros * cashflow_maturities
+        delta = price(cashflows, weighted_zeros)
+        weighted_zeros *= cashflow_maturities
+        return {
+            "price": value,
+            "duration": delta / value,
+            "convexity": price(cashflows, weighted_zeros) / value,
+        }
 
     @classmethod
     def from_fit(cls, real_prices, cashflows, cashflow_maturities, x0=None):
         result = ns_fit(real_prices, cashflows, cashflow_maturities, x0)
         return cls(*result.x)
 
+    @classmethod
+    def batch_fit(cls, prices_by_date, cashflows, cashflow_maturities, x0=None):
+        curves = {}
+        # Curves move little between dates, so warm start from the previous fit.
+        for date, real_prices in prices_by_date.iterrows():
+            result = ns_fit(real_prices, cashflows, cashflow_maturities, x0)
+            x0 = result.x
+            curves[date] = cls(*result.x)
+        return pd.Series(curves, dtype=object)
+
 
 def vasicek(eta, gamma, r0, sigma, maturities):
-    inverse_maturities = (1.0 / maturities).replace(np.inf, 0)
+    inverse_maturities = _inverse(np.asarray(maturities, dtype=np.float64))
     sigma2 = pow(sigma, 2)
     b = 1 / gamma * (1 - np.exp(-gamma * maturities))
     a = 1 / pow(gamma, 2) * (b - maturities) * (
@@ -122,17 +263,70 @@ def vasicek(eta, gamma, r0, sigma, maturities):
 def vasicek_error(x, r0, sigma, real_prices, cashflows, maturities):
     yields = vasicek(*x, r0=r0, sigma=sigma, maturities=maturities)
     zeros = np.exp(-maturities * yields)
-    fitted_prices = price(cashflows, zeros).replace(np.inf, 0)
+    fitted_prices = price(cashflows, zeros)
+    # Overflowing zeros make 0 * inf terms, so clear every non-finite price.
+    fitted_prices[~np.isfinite(fitted_prices)] = 0
     return price_error(real_prices, fitted_prices)
 
 
-def vasicek_fit(r0, sigma, real_prices, cashflows, maturities, x0=None):
+def vasicek_error_grad(x, r0, sigma, real_prices, cashflows, maturities):
+    """Gradient of vasicek_error with respect to (eta, gamma)"""
+    eta, gamma = x
+    maturities = np.asarray(maturities, dtype=np.float64)
+    inverse_maturities = _inverse(maturities)
+    sigma2 = pow(sigma, 2)
+    decay = np.exp(-gamma * maturities)
+    b = (1 - decay) / gamma
+    c = eta * gamma - 0.5 * sigma2
+    a = (b - maturities) * c / pow(gamma, 2) - sigma2 * pow(b, 2) / (4 * gamma)
+    zeros = np.exp(-maturities * (-a + b * r0) * inverse_maturities)
+    fitted_prices = price(cashflows, zeros)
+
+    db_dgamma = (maturities * decay - b) / gamma
+    da_deta = (b - maturities) / gamma
+    da_dgamma = (
+        (db_dgamma * c + (b - maturities) * eta) / pow(gamma, 2)
+        - 2 * (b - maturities) * c / pow(gamma, 3)
+        - sigma2 * (b * db_dgamma / (2 * gamma) - pow(b, 2) / (4 * pow(gamma, 2)))
+    )
+    yield_grads = (
+        -da_deta * inverse_maturities,
+        (r0 * db_dgamma - da_dgamma) * inverse_maturities,
+    )
+    # vasicek_error clears non-finite prices, so those bonds add no slope.
+    finite = np.isfinite(np.asarray(fitted_prices, dtype=np.float64))
+    fitted_prices[~finite] = 0
+    residuals = _residuals(real_prices, fitted_prices)[:, np.newaxis]
+    weights = 2 * residuals * np.asarray(cashflows) * maturities * zeros
+    weights[~finite] = 0
+    return np.array([np.sum(weights * g) for g in yield_grads])
+
+
+def vasicek_fit(
+    r0,
+    sigma,
+    real_prices,
+    cashflows,
+    maturities,
+    x0=None,
+    method="L-BFGS-B",
+    accrued=None,
+    bounds=((-1.0, 1.0), (1e-4, 10.0)),
+):
     x0 = x0 if x0 is not None else [0.1, 0.1]
+    if accrued is not None:
+        # Fit dirty prices, adding the accrued interest once up front.
+        real_prices = real_prices + accrued
+    args = (r0, sigma, *_fit_arrays(real_prices, cashflows, maturities))
+    # The error is badly scaled in (eta, gamma), so a first gradient step can
+    # overflow every price; bounds keep the line search where prices are finite.
     return minimize(
         vasicek_error,
         x0,
-        args=(r0, sigma, real_prices, cashflows, maturities),
-        method="Nelder-Mead",
+        args=args,
+        method=method,
+        jac=vasicek_error_grad if _uses_gradient(method) else None,
+        bounds=bounds,
         options={"maxiter": 1000},
         tol=1e-10,
     )
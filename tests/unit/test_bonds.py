@@ -1,6 +1,7 @@
 import math
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from fixed_income import bonds
@@ -16,6 +17,71 @@ class TestFunctions(unittest.TestCase):
         )
         self.assertAlmostEqual(actual, expected)
 
+    def test_ytm_falls_back_when_not_converged(self):
+        actual = bonds.yield_to_maturity(
+            bond_price=90, face_value=100, periods=8, coupon=6.5, maxiter=1
+        )
+        expected = bonds.yield_to_maturity(
+            bond_price=90, face_value=100, periods=8, coupon=6.5
+        )
+        self.assertAlmostEqual(actual, expected)
+
+    def test_ytm_of_long_zeros_with_negative_yields(self):
+        for bond_price, periods in ((150, 100), (101, 200), (105, 80), (400, 100)):
+            actual = bonds.yield_to_maturity(
+                bond_price=bond_price, face_value=100, periods=periods, coupon=0
+            )
+            expected = math.pow(100 / bond_price, 1 / periods) - 1
+            self.assertAlmostEqual(actual, expected)
+
+    def test_yields_to_maturity_matches_scalar(self):
+        bond_prices = [100, 95, 1.0]
+        face_values = [100, 100, 1.0]
+        periods = [8, 10, 3]
+        coupons = [6.5, 5, 0.0]
+        actual = bonds.yields_to_maturity(bond_prices, face_values, periods, coupons)
+        expected = [
+            bonds.yield_to_maturity(*args)
+            for args in zip(bond_prices, face_values, periods, coupons)
+        ]
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_yields_to_maturity_solves_out_of_domain_lanes(self):
+        bond_prices = [150, 100, 90]
+        periods = [100, 8, 8]
+        coupons = [0.0, 6.5, 6.5]
+        actual = bonds.yields_to_maturity(bond_prices, 100, periods, coupons)
+        expected = [
+            bonds.yield_to_maturity(price, 100, n, coupon)
+            for price, n, coupon in zip(bond_prices, periods, coupons)
+        ]
+        self.assertTrue(np.all(actual > -1.0))
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_price_derivative_vec_matches_scalar(self):
+        ytms = [0.05, 0.0, 0.03]
+        actual = bonds.price_derivative_vec(100, 6.5, 8, ytms)
+        expected = [bonds.price_derivative(100, 6.5, 8, ytm) for ytm in ytms]
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_price_derivative(self):
+        face_value, coupon, periods, ytm, bump = 100, 6.5, 8, 0.05, 1e-6
+        expected = (
+            bonds.price(face_value, coupon, periods, ytm + bump)
+            - bonds.price(face_value, coupon, periods, ytm - bump)
+        ) / (2 * bump)
+        actual = bonds.price_derivative(face_value, coupon, periods, ytm)
+        self.assertAlmostEqual(actual, expected, places=4)
+
+    def test_price_derivative_when_ytm_is_zero(self):
+        face_value, coupon, periods, bump = 100, 6.5, 8, 1e-4
+        expected = (
+            bonds.price(face_value, coupon, periods, bump)
+            - bonds.price(face_value, coupon, periods, -bump)
+        ) / (2 * bump)
+        actual = bonds.price_derivative(face_value, coupon, periods, 0.0)
+        self.assertAlmostEqual(actual, expected, places=3)
+
     def test_price_equals_cash_flows_when_ytm_is_zero(self):
         face_value = 100
         coupon = 6.5
@@ -26,6 +92,60 @@ class TestFunctions(unittest.TestCase):
         )
         self.assertAlmostEqual(actual, expected)
 
+    def test_price_is_continuous_near_zero_ytm(self):
+        at_zero = bonds.price(face_value=100, coupon=6.5, periods=60, ytm=0.0)
+        near_zero = bonds.price(face_value=100, coupon=6.5, periods=60, ytm=1e-12)
+        self.assertAlmostEqual(at_zero, near_zero, places=6)
+
+    def test_price_vec_matches_scalar_price(self):
+        face_values = [100, 100, 1000]
+        coupons = [6.5, 0.0, 25]
+        periods = [8, 4, 20]
+        ytms = [0.05, 0.0, 0.03]
+        actual = bonds.price_vec(face_values, coupons, periods, ytms)
+        expected = [
+            bonds.price(*args) for args in zip(face_values, coupons, periods, ytms)
+        ]
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_price_dispatches_on_array_like(self):
+        actual = bonds.price(100, 6.5, 8, [0.05, 0.06])
+        self.assertEqual(actual.shape, (2,))
+
+    def test_geometric_sums_match_loops(self):
+        n = 17
+        for v in (0.93, 0.999, 1.0, 1.0005):
+            self.assertAlmostEqual(
+                bonds._sum_t_vt(v, n), sum(t * v ** t for t in range(1, n + 1))
+            )
+            self.assertAlmostEqual(
+                bonds._sum_ttp1_vt(v, n),
+                sum(t * (t + 1) * v ** t for t in range(1, n + 1)),
+            )
+
+    def test_sensitivities_near_zero_ytm(self):
+        for ytm in (1e-5, 1e-6, 1e-8):
+            bond = bonds.CouponBond(face_value=100, coupon=2, periods=60, ytm=ytm)
+            pvs = [(t, cf * (1 + ytm) ** -t) for t, cf in bond]
+            duration = sum(t * pv for t, pv in pvs) / bond.price
+            convexity = sum(t * (t + 1) * pv for t, pv in pvs) / bond.price
+            convexity /= (1 + ytm) ** 2
+            self.assertTrue(math.isclose(bond.macaulay_duration, duration))
+            self.assertTrue(math.isclose(bond.ytm_convexity, convexity))
+
+    def test_price_from_cashflows(self):
+        cashflows = [[102.5, 0.0], [2.5, 102.5]]
+        discounts = [[0.99, 0.0], [0.99, 0.98]]
+        actual = bonds.price_from_cashflows(cashflows, discounts)
+        expected = [102.5 * 0.99, 2.5 * 0.99 + 102.5 * 0.98]
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_price_from_cashflows_shared_discounts(self):
+        cashflows = [[102.5, 0.0], [2.5, 102.5]]
+        actual = bonds.price_from_cashflows(cashflows, [0.99, 0.98])
+        expected = [102.5 * 0.99, 2.5 * 0.99 + 102.5 * 0.98]
+        self.assertTrue(np.allclose(actual, expected))
+
     def test_can_bootstrap_is_true(self):
         portfolio = [
             bonds.TreasuryNote(coupon_rate=0.05, maturity_years=t / 2, annual_ytm=0.05)
@@ -40,6 +160,13 @@ class TestFunctions(unittest.TestCase):
         ]
         self.assertFalse(bonds.can_bootstrap(portfolio))
 
+    def test_can_bootstrap_is_false_with_duplicate_periods(self):
+        portfolio = [
+            bonds.TreasuryNote(coupon_rate=0.05, maturity_years=0.5, annual_ytm=0.02),
+            bonds.TreasuryNote(coupon_rate=0.04, maturity_years=0.5, annual_ytm=0.02),
+        ]
+        self.assertFalse(bonds.can_bootstrap(portfolio))
+
     def test_cash_flows(self):
         portfolio = [
             bonds.TreasuryNote(coupon_rate=0.05, maturity_years=0.5, annual_ytm=0.02),
@@ -72,6 +199,11 @@ class TestFunctions(unittest.TestCase):
 
 
 class TestCouponBond(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Bond from chapter 16 of Bodie Kane Marcus - Investments (10th Ed)
+        cls.bkm_bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+
     def test_non_int_periods_causes_assertion_error(self):
         with self.assertRaises(AssertionError):
             bonds.CouponBond(face_value=100, coupon=5, periods=2.5, ytm=0.03)
@@ -112,6 +244,28 @@ class TestCouponBond(unittest.TestCase):
         expected = bonds.CouponBond.from_price(**bond_details)
         self.assertEqual(actual, expected)
 
+    def test_from_dataframe_matches_from_price(self):
+        df = pd.DataFrame(
+            {
+                "bond_price": [100, 95, 150, 101, 60],
+                "coupon": [5, 6.5, 0, 0, 1],
+                "face_value": [100, 100, 100, 100, 100],
+                "periods": [2, 10, 100, 200, 60],
+            }
+        )
+        actual = [bond.ytm for bond in bonds.CouponBond.from_dataframe(df)]
+        expected = [
+            bonds.CouponBond.from_price(**row).ytm
+            for row in df.to_dict(orient="records")
+        ]
+        np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-9)
+
+    def test_to_dataframe(self):
+        bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+        actual = bonds.to_dataframe([bond])
+        self.assertEqual(list(actual.columns), list(bonds.CouponBond._fields))
+        self.assertAlmostEqual(actual.price[0], bond.price)
+
     def test_cash_flow_iteration(self):
         face_value = 100
         coupon = 7
@@ -125,13 +279,13 @@ class TestCouponBond(unittest.TestCase):
 
     def test_macaulay_duration(self):
         """Based question 23a chapter 16 of Bodie Kane Marcus - Investments (10th Ed)"""
-        bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+        bond = self.bkm_bond
         expected = 7.51523225
         self.assertAlmostEqual(bond.macaulay_duration, expected)
 
     def test_ytm_convexity(self):
         """Based question 23b chapter 16 of Bodie Kane Marcus - Investments (10th Ed)"""
-        bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+        bond = self.bkm_bond
         expected = 64.9329593
         self.assertAlmostEqual(bond.ytm_convexity, expected)
 
@@ -147,14 +301,14 @@ class TestCouponBond(unittest.TestCase):
 
     def test_price_change_without_ytm_convexity(self):
         """Based question 23c chapter 16 of Bodie Kane Marcus - Investments (10th Ed)"""
-        bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+        bond = self.bkm_bond
         actual = bond.price_change(ytm_change=0.01)
         expected = -7.02358154
         self.assertAlmostEqual(actual, expected)
 
     def test_price_change_with_ytm_convexity(self):
         """Based question 23d chapter 16 of Bodie Kane Marcus - Investments (10th Ed)"""
-        bond = bonds.CouponBond(ytm=0.07, face_value=100, periods=10, coupon=7)
+        bond = self.bkm_bond
         actual = bond.price_change(ytm_change=0.01, use_convexity=True)
         expected = -6.69891674
         self.assertAlmostEqual(actual, expected)
@@ -166,6 +320,13 @@ class TestZero(unittest.TestCase):
         zero = bonds.Zero(face_value=1, periods=maturity, ytm=0.05)
         self.assertEqual(zero.duration, maturity)
 
+    def test_from_price(self):
+        expected = bonds.Zero(face_value=100, periods=6, ytm=0.04)
+        actual = bonds.Zero.from_price(
+            bond_price=expected.price, face_value=100, periods=6
+        )
+        self.assertEqual(actual, expected)
+
 
 class TestPerpetuity(unittest.TestCase):
     def test_macaulay_duration(self):
@@ -206,6 +367,35 @@ class TestTreasuryNote(unittest.TestCase):
         expected = 4.6040133
         self.assertAlmostEqual(note.duration, expected, places=2)
 
+    def test_from_dataframe(self):
+        df = pd.DataFrame(
+            {
+                "bond_price": [141.5267, 111.7031250],
+                "coupon_rate": [0.08875, 0.04],
+                "maturity_years": [9.5, 5],
+            }
+        )
+        actual = list(bonds.TreasuryNote.from_dataframe(df))
+        expected = [bonds.TreasuryNote.from_price(**row) for _, row in df.iterrows()]
+        self.assertEqual(actual, expected)
+        np.testing.assert_allclose(
+            [note.ytm for note in actual],
+            [note.ytm for note in expected],
+            rtol=0,
+            atol=1e-9,
+        )
+
+
+class TestFloatingRateBond(unittest.TestCase):
+    def test_coupon_after_reset(self):
+        bond = bonds.FloatingRateBond(
+            maturity_years=5, interest_rate=0.04, spread_rate=0.01, freq=2
+        )
+        bond.reset(period=1, interest_rate=0.06)
+        self.assertEqual(bond.face_value, 100)
+        self.assertEqual(bond.periods, 9)
+        self.assertAlmostEqual(bond.coupon, 3.5)
+
 
 class TestLIF(unittest.TestCase):
     def test_from_zeros(self):
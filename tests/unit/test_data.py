@@ -1,14 +1,16 @@
 import datetime
 import os
 import unittest
+from unittest import mock
 
 import numpy as np
 import pandas as pd
-import vcr
 
 from fixed_income import data
 
 DIR = os.path.dirname(os.path.abspath(__file__))
+with open(f"{DIR}/resources/treasury_direct_prices_20171212.html") as f:
+    TREASURY_DIRECT_HTML = f.read()
 
 
 class TestTreasuryDirect(unittest.TestCase):
@@ -29,9 +31,12 @@ class TestTreasuryDirect(unittest.TestCase):
         "SELL": {0: "97.500000", 1: "99.156250"},
     }
 
-    @vcr.use_cassette(f"{DIR}/resources/test_load_data_from_date.yml")
     def test_load_data_from_date(self):
-        df = data.treasury_direct_prices(self.date)
+        data._post_html.cache_clear()
+        response = mock.Mock(ok=True, text=TREASURY_DIRECT_HTML)
+        with mock.patch.object(data._SESSION, "post", return_value=response) as post:
+            df = data.treasury_direct_prices(self.date)
+        post.assert_called_once()
         self.assertTrue(~df.empty)
 
     def test_get_cashflows(self):
@@ -39,24 +44,6 @@ class TestTreasuryDirect(unittest.TestCase):
         df = pd.DataFrame(self.test_data)
         expected_cashflows = np.array(
             [
-                [
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    1.125,
-                    101.125,
-                ],
                 [
                     1.0,
                     1.0,
@@ -75,28 +62,28 @@ class TestTreasuryDirect(unittest.TestCase):
                     1.0,
                     101.0,
                 ],
+                [
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    1.125,
+                    101.125,
+                ],
             ]
         )
         expected_maturities = np.array(
             [
-                [
-                    0.42624079,
-                    0.92624079,
-                    1.42624079,
-                    1.92624079,
-                    2.42624079,
-                    2.92624079,
-                    3.42624079,
-                    3.92624079,
-                    4.42624079,
-                    4.92624079,
-                    5.42624079,
-                    5.92624079,
-                    6.42624079,
-                    6.92624079,
-                    7.42624079,
-                    7.92624079,
-                ],
                 [
                     0.17435334,
                     0.67435334,
@@ -115,6 +102,24 @@ class TestTreasuryDirect(unittest.TestCase):
                     7.17435334,
                     7.67435334,
                 ],
+                [
+                    0.42624079,
+                    0.92624079,
+                    1.42624079,
+                    1.92624079,
+                    2.42624079,
+                    2.92624079,
+                    3.42624079,
+                    3.92624079,
+                    4.42624079,
+                    4.92624079,
+                    5.42624079,
+                    5.92624079,
+                    6.42624079,
+                    6.92624079,
+                    7.42624079,
+                    7.92624079,
+                ],
             ]
         )
 
@@ -152,3 +157,9 @@ class TestToDecimalPrice(unittest.TestCase):
     def test_exception_on_tick_greater_than_31(self):
         with self.assertRaises(AssertionError):
             data.to_decimal_price(price_in_32s="124'320")
+
+    def test_vectorized_matches_scalar(self):
+        prices_in_32s = ["124'000", "124'07", "124'250", "124'002", "124'177"]
+        actual = data.to_decimal_prices(prices_in_32s).tolist()
+        expected = [data.to_decimal_price(p) for p in prices_in_32s]
+        self.assertEqual(actual, expected)
@@ -84,6 +84,24 @@ class TestConversionFactor(unittest.TestCase):
 
         self.assertAlmostEqual(expected, actual, places=6)
 
+    def test_vectorized_matches_scalar(self):
+        codes = ["ZT", "ZN", "UB"]
+        coupons = [0.0075, 0.03375, 0.04375]
+        time_to_maturity = [1 + 11 / 12 + 29 / 365, 9 + 5 / 12, 29 + 11 / 12]
+        actual = futures.conversion_factor(codes, coupons, time_to_maturity)
+        expected = [
+            futures.conversion_factor(*args)
+            for args in zip(codes, coupons, time_to_maturity)
+        ]
+        self.assertTrue(np.allclose(expected, actual))
+
+    def test_cache_clear(self):
+        expected = futures.conversion_factor("ZN", 0.03375, 9 + 5 / 12)
+        futures.conversion_factor.cache_clear()
+        self.assertEqual(futures._cached_conversion_factor.cache_info().currsize, 0)
+        actual = futures.conversion_factor("ZN", 0.03375, 9 + 5 / 12)
+        self.assertEqual(expected, actual)
+
     def test_not_support_error(self):
         with self.assertRaises(NotImplementedError):
             futures.conversion_factor("?", coupon=4.375 / 100, time_to_maturity=1.5)
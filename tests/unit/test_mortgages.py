@@ -19,3 +19,21 @@ class TestFunctions(unittest.TestCase):
 
         expected = loan / np.sum(discounts)
         self.assertAlmostEqual(actual, expected)
+
+    def test_coupon_without_interest(self):
+        actual = mortgages.coupon(loan=120000, maturity=10, mortgage_rate=0, freq=12)
+        self.assertAlmostEqual(actual, 1000)
+
+    def test_coupon_of_array_rates(self):
+        mortgage_rates = np.array([0.04492, 0.0, 0.06])
+        actual = mortgages.coupon(100000, 26, mortgage_rates, freq=4)
+        expected = [mortgages.coupon(100000, 26, r, freq=4) for r in mortgage_rates]
+        self.assertTrue(np.allclose(actual, expected))
+
+    def test_payments_amortize_loan(self):
+        loan = 100000
+        schedule = mortgages.payments(loan, maturity=26, mortgage_rate=0.04492, freq=4)
+        self.assertAlmostEqual(schedule.value.iloc[0], loan)
+        self.assertAlmostEqual(schedule.value.iloc[-1], 0, places=6)
+        principal = schedule.payment - schedule.interest
+        self.assertAlmostEqual(principal.sum(), loan, places=6)
@@ -1,6 +1,9 @@
 import math
 import unittest
 
+import numpy as np
+import pandas as pd
+
 from fixed_income import rates
 
 
@@ -10,6 +13,29 @@ class TestFunctions(unittest.TestCase):
         expected = 358
         self.assertEqual(actual, expected)
 
+    def test_compute_days_between_vec(self):
+        actual = rates.compute_days_between_vec(
+            ["9/20/2017", "1/1/2018"], ["9/13/2018", "1/31/2018"]
+        )
+        expected = [358, 30]
+        self.assertEqual(actual.tolist(), expected)
+        actual = rates.compute_days_between(
+            ["9/20/2017", "1/1/2018"], ["9/13/2018", "1/31/2018"]
+        )
+        self.assertEqual(actual.tolist(), expected)
+
+    def test_compute_days_between_vec_of_series(self):
+        actual = rates.compute_days_between_vec(
+            pd.Series(["9/20/2017", "1/1/2018"]),
+            pd.Series(pd.to_datetime(["9/13/2018", "1/31/2018"])),
+        )
+        self.assertEqual(actual.tolist(), [358, 30])
+
+    def test_compute_days_between_series(self):
+        end_dates = pd.Series(["9/13/2018", "1/31/2018"])
+        actual = rates.compute_days_between("9/20/2017", end_dates)
+        self.assertEqual(actual.tolist(), [358, 133])
+
     def test_bond_equivalent_yield(self):
         actual = rates.bond_equivalent_yield(
             discount_yield=1.135 / 100, days_to_maturity=168
@@ -54,6 +80,29 @@ class TestFunctions(unittest.TestCase):
         actual = rates.discount_factor_from(spot_rate=spot_rate, term=term)
         self.assertAlmostEqual(actual, expected)
 
+    def test_discount_factor_from_spot_rate_array(self):
+        spot_rates = np.array([0.03, 0.05])
+        terms = np.array([1.0, 2.5])
+        freq = 2
+        expected = np.power(1 + spot_rates / freq, -freq * terms)
+        actual = rates.discount_factor_from(spot_rates, terms, freq)
+        self.assertTrue(np.allclose(actual, expected))
+        self.assertTrue(
+            np.allclose(rates.spot_rate_from(actual, terms, freq), spot_rates)
+        )
+
+    def test_discount_factor_and_spot_rate_vec_match_scalar(self):
+        spot_rates = [0.02, 0.04, 0.05]
+        terms = [0.5, 1.0, 2.0]
+        for freq in (2, math.inf):
+            discount_factors = rates.discount_factor_from_vec(spot_rates, terms, freq)
+            for df, spot_rate, term in zip(discount_factors, spot_rates, terms):
+                expected = rates.discount_factor_from(spot_rate, term, freq)
+                self.assertAlmostEqual(df, expected)
+            actual = rates.spot_rate_from_vec(discount_factors, terms, freq)
+            for a, expected in zip(actual, spot_rates):
+                self.assertAlmostEqual(a, expected)
+
     def test_forward_rate_from_spot_rate(self):
         def df(spot_rate, term, freq):
             return math.pow(1 + spot_rate / freq, -freq * term)
@@ -90,3 +139,30 @@ class TestFunctions(unittest.TestCase):
         self.assertAlmostEqual(
             discount_factor_2, discount_factor_1 * forward_discount_factor
         )
+
+    def test_add_forward_discounts_and_rates(self):
+        rates_df = pd.DataFrame(
+            {"Maturity": [0.25, 0.5, 0.75, 1.0], "Zero": [0.99, 0.98, 0.965, 0.95]}
+        )
+        actual = rates.add_forward_discounts_and_rates(rates_df.copy())
+        zeros = rates_df["Zero"]
+        forward_discounts = zeros / zeros.shift(1)
+        expected_rates = (1 / forward_discounts - 1) / rates_df["Maturity"].diff()
+        self.assertTrue(
+            np.allclose(actual["Forward Discount"], forward_discounts, equal_nan=True)
+        )
+        self.assertTrue(
+            np.allclose(actual["Forward Rate"], expected_rates, equal_nan=True)
+        )
+
+    def test_add_forward_discounts_matches_shift(self):
+        rates_df = pd.DataFrame(
+            {"Maturity": [0.25, 0.5, 0.75, 1.0], "Zero": [0.99, 0.98, 0.965, 0.95]}
+        )
+        zeros = rates_df["Zero"]
+        for start_maturity in (-1, 0, 2, 5):
+            actual = rates.add_forward_discounts(rates_df.copy(), start_maturity)
+            expected = zeros / zeros.shift(start_maturity)
+            self.assertTrue(
+                np.allclose(actual["Forward Discount"], expected, equal_nan=True)
+            )
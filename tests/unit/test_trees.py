@@ -43,6 +43,30 @@ class TestTrees(TestCase):
         self.assertTrue(np.isclose(actual_rate_tree, expected_rate_tree).all())
         self.assertTrue(np.isclose(actual_zero_tree, expected_zero_tree).all())
 
+    def test_ho_lee_float32(self):
+        dt = 0.5
+        tree = trees.initialize_tree(
+            maturity=1, time_step=dt, is_zero=False, dtype=np.float32
+        )
+        tree[0, 0] = 0.050682155
+
+        actual_rate_tree, actual_zero_tree = trees.ho_lee(
+            theta=-0.072299819,
+            rate_tree=tree,
+            period=1,
+            sigma=0.00671631656750658,
+            time_step=dt,
+        )
+
+        expected_zero_tree = [
+            [0.96792141, 0.99040562, 1.0],
+            [0.0, 0.9951204, 1.0],
+            [0.0, 0.0, 1.0],
+        ]
+        self.assertEqual(actual_rate_tree.dtype, np.float32)
+        self.assertEqual(actual_zero_tree.dtype, np.float32)
+        self.assertTrue(np.isclose(actual_zero_tree, expected_zero_tree).all())
+
     def test_black_derman_toy(self):
         r0 = 0.050682155
         dt = 0.5
@@ -90,6 +114,14 @@ class TestTrees(TestCase):
         average_error = np.abs(zeros - fitted_zeros).mean()
         self.assertLess(average_error, 1e-7)
 
+    def test_black_derman_toy_fit(self):
+        zeros = np.array([0.9750, 0.9514, 0.9286, 0.9062, 0.8841, 0.8622])
+        _, fitted_zeros, _ = trees.fit(
+            trees.simple_bdt, zeros=zeros, sigma=0.22225391407878499, time_step=0.5
+        )
+        average_error = np.abs(zeros - fitted_zeros).mean()
+        self.assertLess(average_error, 1e-7)
+
     def test_bond_price(self):
         rate_tree = np.load(RATE_TREE)
         actual = trees.bond_price(rate_tree, coupon=6, maturity=20, time_step=0.5)[0, 0]
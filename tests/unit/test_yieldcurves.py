@@ -1,3 +1,4 @@
+import functools
 import os
 from unittest import TestCase
 
@@ -11,25 +12,78 @@ TIPS_FILE = f"{DIR}/resources/DataTIPS.xlsx"
 VASICEK_FILE = f"{DIR}/resources/VasicekData.xlsx"
 
 
+@functools.lru_cache(maxsize=None)
+def read_sheets(path, sheet_names):
+    return pd.read_excel(path, sheet_name=list(sheet_names))
+
+
+def indexed_by_first_column(df):
+    return df.set_index(df.columns[0])
+
+
+def central_difference(f, x, h=1e-6):
+    x = np.asarray(x, dtype=np.float64)
+    steps = h * np.eye(len(x))
+    return np.array([(f(x + step) - f(x - step)) / (2 * h) for step in steps])
+
+
 class TestNelsonSiegelFit(TestCase):
-    def setUp(self):
-        super().setUp()
-        self.quotes = pd.read_excel(TIPS_FILE, sheet_name="Treasury_Quotes")
-        self.quotes.index = self.quotes["Time To Maturity"].values
-        self.cashflows = pd.read_excel(
-            TIPS_FILE, sheet_name="Treasury_Cashflows", index_col=0
+    @classmethod
+    def setUpClass(cls):
+        sheets = read_sheets(
+            TIPS_FILE,
+            ("Treasury_Quotes", "Treasury_Cashflows", "Treasury_Cashflows_Maturity"),
         )
-        self.cf_maturities = pd.read_excel(
-            TIPS_FILE, sheet_name="Treasury_Cashflows_Maturity", index_col=0
+        cls.quotes = sheets["Treasury_Quotes"].copy()
+        cls.quotes.index = cls.quotes["Time To Maturity"].values
+        cls.cashflows = indexed_by_first_column(sheets["Treasury_Cashflows"])
+        cls.cf_maturities = indexed_by_first_column(
+            sheets["Treasury_Cashflows_Maturity"]
         )
 
     def test_fit(self):
         prices = (self.quotes["Bid Price"] + self.quotes["Ask Price"]) / 2
         result = yieldcurves.ns_fit(prices, self.cashflows, self.cf_maturities)
         actual = result.x
-        expected = np.array([0.03935294, -0.02175923, -0.07813487, 1.91292469])
+        expected = np.array([0.03935274, -0.02175979, -0.07813789, 1.91280968])
         self.assertTrue(all(np.isclose(actual, expected)))
 
+    def test_fit_arrays_skip_missing_quotes(self):
+        prices = (self.quotes["Bid Price"] + self.quotes["Ask Price"]) / 2
+        prices.iloc[0] = np.nan
+        x = [0.0394, -0.0218, -0.0781, 1.9129]
+        arrays = yieldcurves._fit_arrays(prices, self.cashflows, self.cf_maturities)
+        actual = yieldcurves.ns_error(x, *arrays)
+        expected = yieldcurves.ns_error(
+            x, prices, self.cashflows, self.cf_maturities.to_numpy()
+        )
+        self.assertAlmostEqual(actual, expected)
+
+    def test_batch_fit(self):
+        prices = (self.quotes["Bid Price"] + self.quotes["Ask Price"]) / 2
+        # The maturity labels repeat, so build the rows from the raw prices.
+        prices_by_date = pd.DataFrame(
+            [prices.to_numpy()] * 2,
+            index=["day1", "day2"],
+            columns=self.cashflows.index,
+        )
+        curves = yieldcurves.NelsonSiegel.batch_fit(
+            prices_by_date, self.cashflows, self.cf_maturities
+        )
+        expected = np.array([0.03935274, -0.02175979, -0.07813789, 1.91280968])
+        self.assertEqual(curves.index.tolist(), ["day1", "day2"])
+        for curve in curves:
+            actual = [curve.theta0, curve.theta1, curve.theta2, curve.kappa]
+            self.assertTrue(np.allclose(actual, expected, rtol=1e-4))
+
+    def test_error_grad(self):
+        prices = (self.quotes["Bid Price"] + self.quotes["Ask Price"]) / 2
+        args = (prices, self.cashflows, self.cf_maturities)
+        x = [0.03, -0.02, -0.05, 1.5]
+        actual = yieldcurves.ns_error_grad(x, *args)
+        expected = central_difference(lambda y: yieldcurves.ns_error(y, *args), x)
+        self.assertTrue(np.allclose(actual, expected, rtol=1e-4))
+
     def test_duration(self):
         ns = yieldcurves.NelsonSiegel(
             theta0=0.0394, theta1=-0.0218, theta2=-0.0781, kappa=1.9129
@@ -46,19 +100,56 @@ class TestNelsonSiegelFit(TestCase):
         expected = 0.75 ** 2
         self.assertEqual(actual, expected)
 
+    def test_price_skips_ragged_padding(self):
+        ns = yieldcurves.NelsonSiegel(
+            theta0=0.0394, theta1=-0.0218, theta2=-0.0781, kappa=1.9129
+        )
+        cashflows = pd.DataFrame([[101, np.nan], [1, 101]])
+        maturities = pd.DataFrame([[0.5, np.nan], [0.5, 1.0]])
+        actual = ns.price(cashflows, maturities)
+        expected = [
+            ns.price(cashflows.loc[i].dropna(), maturities.loc[i].dropna())
+            for i in cashflows.index
+        ]
+        self.assertTrue(np.allclose(actual, expected))
 
-class TestVasicekFit(TestCase):
-    def setUp(self):
-        super().setUp()
-        self.quotes = pd.read_excel(VASICEK_FILE, sheet_name="Quotes")
-        self.quotes.index = range(1, len(self.quotes) + 1)
-        self.cashflows = pd.read_excel(
-            VASICEK_FILE, sheet_name="CashFlows", index_col=0
+    def test_duration_and_convexity_skip_ragged_padding(self):
+        ns = yieldcurves.NelsonSiegel(
+            theta0=0.0394, theta1=-0.0218, theta2=-0.0781, kappa=1.9129
+        )
+        cashflows = pd.DataFrame([[101, np.nan], [1, 101]])
+        maturities = pd.DataFrame([[0.5, np.nan], [0.5, 1.0]])
+        for measure in (ns.duration, ns.convexity):
+            actual = measure(cashflows, maturities)
+            expected = [
+                measure(cashflows.loc[i].dropna(), maturities.loc[i].dropna())
+                for i in cashflows.index
+            ]
+            self.assertTrue(np.allclose(actual, expected))
+
+    def test_risk_report(self):
+        ns = yieldcurves.NelsonSiegel(
+            theta0=0.0394, theta1=-0.0218, theta2=-0.0781, kappa=1.9129
         )
-        self.cf_maturities = pd.read_excel(
-            VASICEK_FILE, sheet_name="Maturities", index_col=0
+        cashflows = pd.Series([1, 1, 101])
+        maturities = pd.Series([0.5, 1.0, 1.5])
+        actual = ns.risk_report(cashflows, maturities)
+        self.assertAlmostEqual(actual["price"], ns.price(cashflows, maturities))
+        self.assertAlmostEqual(actual["duration"], ns.duration(cashflows, maturities))
+        self.assertAlmostEqual(
+            actual["convexity"], ns.convexity(cashflows, maturities)
         )
 
+
+class TestVasicekFit(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        sheets = read_sheets(VASICEK_FILE, ("Quotes", "CashFlows", "Maturities"))
+        cls.quotes = sheets["Quotes"].copy()
+        cls.quotes.index = range(1, len(cls.quotes) + 1)
+        cls.cashflows = indexed_by_first_column(sheets["CashFlows"])
+        cls.cf_maturities = indexed_by_first_column(sheets["Maturities"])
+
     def test_fit(self):
         r0 = 0.011499737607216544
         sigma = 0.032261681963642166
@@ -71,3 +162,28 @@ class TestVasicekFit(TestCase):
         actual = result.x
         expected = np.array([0.01768098, 0.2130499])
         self.assertTrue(all(np.isclose(actual, expected)))
+
+    def test_fit_with_accrued(self):
+        r0 = 0.011499737607216544
+        sigma = 0.032261681963642166
+        clean_prices = (self.quotes["Bid"] + self.quotes["Ask"]) / 2
+        result = yieldcurves.vasicek_fit(
+            r0,
+            sigma,
+            clean_prices,
+            self.cashflows,
+            self.cf_maturities,
+            accrued=self.quotes["AccruedInterest"],
+        )
+        expected = np.array([0.01768098, 0.2130499])
+        self.assertTrue(all(np.isclose(result.x, expected)))
+
+    def test_error_grad(self):
+        prices = (self.quotes["Bid"] + self.quotes["Ask"]) / 2 + self.quotes[
+            "AccruedInterest"
+        ]
+        args = (0.0115, 0.0323, prices, self.cashflows, self.cf_maturities)
+        x = [0.02, 0.25]
+        actual = yieldcurves.vasicek_error_grad(x, *args)
+        expected = central_difference(lambda y: yieldcurves.vasicek_error(y, *args), x)
+        self.assertTrue(np.allclose(actual, expected, rtol=1e-4))